@@ -0,0 +1,95 @@
+# asr/asr_batch.py
+# Dynamic micro-batching: requests that arrive within a short window are
+# decoded together in one batched Whisper forward pass instead of queueing
+# for the model one at a time.
+
+import queue, threading, time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class BatchScheduler:
+    """Collects submitted items and hands them to `run_batch(items) -> results`.
+
+    A batch closes when it reaches `max_batch` items or when the oldest
+    item has waited `window_ms` — so no request waits longer than the
+    window for company, however quiet the service is.
+    """
+
+    def __init__(self, run_batch, max_batch=8, window_ms=30, concurrency=1):
+        self.run_batch = run_batch
+        self.max_batch = max_batch
+        self.window    = window_ms / 1000
+        self.queue     = queue.Queue()
+        # With a worker pool several batches can be in flight at once
+        self.slots     = threading.Semaphore(concurrency)
+        self.executor  = ThreadPoolExecutor(concurrency, thread_name_prefix="asr-batch") if concurrency > 1 else None
+        self.lock      = threading.Lock()
+        self.batches   = 0
+        self.items     = 0
+        self.sizes     = {}      # batch size → how many batches had it
+        self.wait_ms   = 0.0
+        self.run_ms    = 0.0
+        threading.Thread(target=self._loop, daemon=True, name="asr-batcher").start()
+
+    def submit(self, item):
+        fut = Future()
+        self.queue.put((item, fut, time.time()))
+        return fut
+
+    def _loop(self):
+        while True:
+            self.slots.acquire()
+            first = self.queue.get()
+            batch = [first]
+            deadline = first[2] + self.window
+            while len(batch) < self.max_batch:
+                # Past the deadline we still take whatever is already queued
+                remaining = deadline - time.time()
+                try:
+                    if remaining > 0:
+                        batch.append(self.queue.get(timeout=remaining))
+                    else:
+                        batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if self.executor:
+                self.executor.submit(self._run, batch)
+            else:
+                self._run(batch)
+
+    def _run(self, batch):
+        try:
+            self._run_batch(batch)
+        finally:
+            self.slots.release()
+
+    def _run_batch(self, batch):
+        started = time.time()
+        try:
+            results = self.run_batch([item for item, _, _ in batch])
+            for (_, fut, _), res in zip(batch, results):
+                fut.set_result(res)
+        except Exception as e:
+            for _, fut, _ in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+        with self.lock:
+            self.batches += 1
+            self.items   += len(batch)
+            self.sizes[len(batch)] = self.sizes.get(len(batch), 0) + 1
+            self.wait_ms += sum((started - t) * 1000 for _, _, t in batch)
+            self.run_ms  += (time.time() - started) * 1000
+
+    def stats(self):
+        with self.lock:
+            return {
+                "queue_depth":    self.queue.qsize(),
+                "batches":        self.batches,
+                "items":          self.items,
+                "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0,
+                "batch_sizes":    dict(sorted(self.sizes.items())),
+                "avg_wait_ms":    round(self.wait_ms / self.items, 1) if self.items else 0,
+                "avg_batch_ms":   round(self.run_ms / self.batches, 1) if self.batches else 0,
+                "max_batch":      self.max_batch,
+                "window_ms":      round(self.window * 1000),
+            }
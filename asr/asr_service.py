@@ -1,34 +1,206 @@
-import whisper
-import tempfile
 import os
+import multiprocessing
 from flask import Flask, request, jsonify
+from asr_stream import StreamRegistry
+from audio_io import decode_audio
+from asr_batch import BatchScheduler
+from asr_backends import load_backend, warmup, WINDOW
+from asr_workers import WorkerPool, CTX
+import vad
 
 app = Flask(__name__)
-model = whisper.load_model("base")
 
-@app.route("/transcribe", methods=["POST"])
-def transcribe():
-    if "audio" not in request.files:
-        return jsonify({"error": "No audio file"}), 400
+# ── MODELS ──────────────────────────────────
+# ASR_BACKEND       whisper | faster-whisper
+# ASR_MODEL         model size for short commands (tiny/base/small/...)
+# ASR_COMPUTE_TYPE  e.g. int8 for faster-whisper, float16 for GPU whisper
+# ASR_LONG_MODEL    optional bigger model for clips over ASR_LONG_SECONDS
+# ASR_WORKERS       >1 runs inference in that many worker processes
+ASR_BACKEND      = os.getenv("ASR_BACKEND", "whisper")
+ASR_MODEL        = os.getenv("ASR_MODEL", "base")
+ASR_COMPUTE_TYPE = os.getenv("ASR_COMPUTE_TYPE") or None
+ASR_LONG_MODEL   = os.getenv("ASR_LONG_MODEL") or None
+ASR_LONG_SECONDS = float(os.getenv("ASR_LONG_SECONDS", "15"))
+ASR_WORKERS      = int(os.getenv("ASR_WORKERS", "1"))
+
+# Spawned pool workers re-import this file; they must not load models here
+IS_POOL_CHILD = multiprocessing.parent_process() is not None
+POOL = None
+
+if IS_POOL_CHILD:
+    model = long_model = None
+elif ASR_WORKERS > 1:
+    specs = {"short": (ASR_BACKEND, ASR_MODEL, ASR_COMPUTE_TYPE)}
+    if ASR_LONG_MODEL:
+        specs["long"] = (ASR_BACKEND, ASR_LONG_MODEL, ASR_COMPUTE_TYPE)
+    preloaded = None
+    if CTX.get_start_method() == "fork":
+        # Load once here and let the workers share the pages copy-on-write.
+        # No warmup in the parent: it would start thread pools before fork.
+        preloaded = {name: load_backend(*spec) for name, spec in specs.items()}
+    POOL = WorkerPool(specs, workers=ASR_WORKERS, preloaded=preloaded)
+    model = POOL.backend("short")
+    long_model = POOL.backend("long") if ASR_LONG_MODEL else model
+else:
+    model = load_backend(ASR_BACKEND, ASR_MODEL, ASR_COMPUTE_TYPE)
+    long_model = load_backend(ASR_BACKEND, ASR_LONG_MODEL, ASR_COMPUTE_TYPE) if ASR_LONG_MODEL else model
+    for m in {id(model): model, id(long_model): long_model}.values():
+        warmup(m)
+
+# VAD_SPLIT=1 transcribes each speech segment on its own instead of one
+# trimmed clip — better for long dictation with big pauses.
+VAD_SPLIT = os.getenv("VAD_SPLIT", "0") == "1"
+VAD_STATS = vad.VadStats()
+
+# ── MICRO-BATCHING ──────────────────────────
+# Short clips are decoded together in one batched pass; clips past
+# ASR_LONG_SECONDS (or Whisper's 30 s window) go to the long model alone.
+BATCH_WINDOW_MS = int(os.getenv("ASR_BATCH_WINDOW_MS", "30"))
+MAX_BATCH       = int(os.getenv("ASR_MAX_BATCH", "8"))
+
+BATCHER = BatchScheduler(lambda clips: model.transcribe_batch(clips), max_batch=MAX_BATCH,
+                         window_ms=BATCH_WINDOW_MS, concurrency=max(1, ASR_WORKERS))
 
-    audio_file = request.files["audio"]
-    tmp_path = tempfile.mktemp(suffix=".webm")
-    audio_file.save(tmp_path)
+def is_long(clip):
+    return len(clip) > WINDOW or (ASR_LONG_MODEL and len(clip) > ASR_LONG_SECONDS * 16000)
 
+def transcribe_clips(clips):
+    """Texts for several clips; short ones all go into the batcher before we wait."""
+    pending = [c if is_long(c) else BATCHER.submit(c) for c in clips]
+    return [long_model.transcribe(p) if not hasattr(p, "result") else p.result() for p in pending]
+
+def transcribe_audio(audio_bytes, fmt=None):
+    """Run Whisper over one uploaded recording and return (text, vad_info).
+    The upload is decoded in memory — see audio_io.decode_audio for `fmt`.
+    Recordings with no speech come back as "" without touching the model."""
+    info = {}
     try:
-        result = model.transcribe(tmp_path, language="en")
-        text = result["text"].strip()
-        print(f"[ASR] Transcribed: {text}")
+        audio = decode_audio(audio_bytes, fmt)
+        pieces, info = vad.trim(audio, split=VAD_SPLIT)
+        VAD_STATS.record(info["input_seconds"], info["kept_seconds"])
+        text = " ".join(t for t in transcribe_clips(pieces) if t)
+        print(f"[ASR] Transcribed: {text!r} (VAD dropped {info['dropped_seconds']}s)")
     except Exception as e:
         print(f"[ASR ERROR] {e}")
         text = "sorry I could not hear that"
 
+    return text, info
+
+def handle_transcribe(data):
+    if not data.get("audio"):
+        return {"error": "No audio file"}
+    text, info = transcribe_audio(data["audio"], data.get("format"))
+    return {"text": text, "vad": info}
+
+# ── STREAMING SESSIONS ──────────────────────
+# The browser uploads its 100 ms recorder chunks as they are produced;
+# partial transcripts come back with each chunk and the final one only
+# has to redo the last few seconds.
+def whisper_segments(audio):
+    if not vad.speech_segments(audio):
+        return []
+    return model.segments(audio)
+
+STREAMS = StreamRegistry(whisper_segments)
+
+def handle_stream_start(data):
+    session = STREAMS.start()
+    print(f"[ASR] Stream {session.id[:8]} started")
+    return {"sid": session.id}
+
+def handle_stream_chunk(data):
+    session = STREAMS.get(data.get("sid", ""))
+    if session is None:
+        return {"error": "Unknown stream"}
+    if data.get("audio"):
+        session.feed(data["audio"])
+    return {"partial": session.text, "seconds": round(session.samples / 16000, 1)}
+
+def handle_stream_finish(data):
+    session = STREAMS.pop(data.get("sid", ""))
+    if session is None:
+        return {"error": "Unknown stream"}
     try:
-        os.remove(tmp_path)
-    except:
-        pass
+        text = session.finish()
+    except Exception as e:
+        print(f"[ASR ERROR] {e}")
+        text = "sorry I could not hear that"
+    finally:
+        session.close()
+    print(f"[ASR] Stream {session.id[:8]} transcribed: {text}")
+    return {"text": text}
+
+def handle_vad_stats(data):
+    return VAD_STATS.snapshot()
+
+def handle_batch_stats(data):
+    return BATCHER.stats()
+
+def handle_models(data):
+    return {
+        "backend":      ASR_BACKEND,
+        "model":        model.size,
+        "long_model":   long_model.size,
+        "long_seconds": ASR_LONG_SECONDS if ASR_LONG_MODEL else None,
+        "compute_type": ASR_COMPUTE_TYPE,
+        "workers":      ASR_WORKERS,
+    }
+
+def handle_workers(data):
+    if POOL is None:
+        return {"workers": [], "mode": "in-process"}
+    return POOL.stats()
+
+# Used by the gateway when all services run in one process
+HANDLERS = {
+    "/vad_stats":     handle_vad_stats,
+    "/batch_stats":   handle_batch_stats,
+    "/models":        handle_models,
+    "/workers":       handle_workers,
+    "/transcribe":    handle_transcribe,
+    "/stream/start":  handle_stream_start,
+    "/stream/chunk":  handle_stream_chunk,
+    "/stream/finish": handle_stream_finish,
+}
+
+@app.route("/transcribe", methods=["POST"])
+def transcribe():
+    if "audio" not in request.files:
+        return jsonify({"error": "No audio file"}), 400
+    # ?format=pcm_s16le|pcm_f32le for raw 16 kHz mono samples (skips decoding)
+    fmt = request.form.get("format") or request.args.get("format")
+    return jsonify(handle_transcribe({"audio": request.files["audio"].read(), "format": fmt}))
+
+@app.route("/vad_stats", methods=["GET"])
+def vad_stats():
+    return jsonify(handle_vad_stats({}))
+
+@app.route("/batch_stats", methods=["GET"])
+def batch_stats():
+    return jsonify(handle_batch_stats({}))
+
+@app.route("/models", methods=["GET"])
+def models():
+    return jsonify(handle_models({}))
+
+@app.route("/workers", methods=["GET"])
+def workers():
+    return jsonify(handle_workers({}))
+
+@app.route("/stream/start", methods=["POST"])
+def stream_start():
+    return jsonify(handle_stream_start({}))
+
+@app.route("/stream/chunk", methods=["POST"])
+def stream_chunk():
+    audio  = request.files.get("audio")
+    result = handle_stream_chunk({"sid": request.form.get("sid", ""), "audio": audio.read() if audio else b""})
+    return jsonify(result), 404 if "error" in result else 200
 
-    return jsonify({"text": text})
+@app.route("/stream/finish", methods=["POST"])
+def stream_finish():
+    result = handle_stream_finish(request.get_json(silent=True) or {})
+    return jsonify(result), 404 if "error" in result else 200
 
 if __name__ == "__main__":
     print("ASR Service running on port 5001...")
@@ -0,0 +1,146 @@
+# asr/asr_stream.py
+# Incremental transcription for audio that arrives in chunks while the
+# user is still speaking. Each session feeds its chunks into one long-lived
+# ffmpeg process, so decoding keeps pace with recording, and Whisper runs
+# over a sliding window of the undecided tail in the background.
+
+import subprocess, threading, time, uuid
+from audio_io import pcm16_to_float
+
+SAMPLE_RATE    = 16000
+PARTIAL_EVERY  = 1.0     # seconds of new audio before another partial pass
+COMMIT_AFTER   = 10.0    # once the tail is this long, freeze all but its last segment
+SESSION_TTL    = 120     # idle sessions are dropped after this many seconds
+
+
+class StreamSession:
+    """One recording in progress.
+
+    `transcribe(audio)` must take float32 16 kHz mono samples and return
+    Whisper-style segments: [{"start": s, "end": s, "text": "..."}].
+    """
+
+    def __init__(self, transcribe):
+        self.id          = uuid.uuid4().hex
+        self.transcribe  = transcribe
+        self.pcm         = bytearray()
+        self.pcm_lock    = threading.Lock()
+        self.committed   = ""        # text that will not change any more
+        self.committed_at = 0        # sample offset where the committed text ends
+        self.partial     = ""        # best guess for the audio after committed_at
+        self.partial_at  = 0         # how many samples the last partial pass saw
+        self.busy        = threading.Lock()
+        self.touched     = time.time()
+        self.ffmpeg = subprocess.Popen(
+            ["ffmpeg", "-loglevel", "quiet", "-i", "pipe:0",
+             "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+        self.reader = threading.Thread(target=self._read_pcm, daemon=True)
+        self.reader.start()
+
+    def _read_pcm(self):
+        while True:
+            data = self.ffmpeg.stdout.read(4096)
+            if not data:
+                break
+            with self.pcm_lock:
+                self.pcm.extend(data)
+
+    def _audio(self, start=0):
+        with self.pcm_lock:
+            raw = bytes(self.pcm[start * 2:])
+        return pcm16_to_float(raw)
+
+    @property
+    def samples(self):
+        with self.pcm_lock:
+            return len(self.pcm) // 2
+
+    @property
+    def text(self):
+        return (self.committed + " " + self.partial).strip()
+
+    # ── feeding ─────────────────────────────
+    def feed(self, chunk):
+        self.touched = time.time()
+        try:
+            self.ffmpeg.stdin.write(chunk)
+            self.ffmpeg.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            print(f"[ASR STREAM] Decoder closed: {e}")
+        if self.samples - self.partial_at >= PARTIAL_EVERY * SAMPLE_RATE and not self.busy.locked():
+            threading.Thread(target=self._partial_pass, daemon=True).start()
+
+    def _partial_pass(self):
+        if not self.busy.acquire(blocking=False):
+            return
+        try:
+            start = self.committed_at
+            audio = self._audio(start)
+            self.partial_at = start + len(audio)
+            if len(audio) < SAMPLE_RATE // 2:
+                return
+            segments = self.transcribe(audio)
+            # Long tail: everything but the last segment is settled — commit it
+            # so later passes (and the final one) only redo the short remainder.
+            if len(audio) >= COMMIT_AFTER * SAMPLE_RATE and len(segments) > 1:
+                settled = segments[:-1]
+                self.committed    = (self.committed + " " + " ".join(s["text"].strip() for s in settled)).strip()
+                self.committed_at = start + int(settled[-1]["end"] * SAMPLE_RATE)
+                segments = segments[-1:]
+            self.partial = " ".join(s["text"].strip() for s in segments).strip()
+        except Exception as e:
+            print(f"[ASR STREAM ERROR] {e}")
+        finally:
+            self.busy.release()
+
+    # ── finishing ───────────────────────────
+    def finish(self):
+        """Flush the decoder and transcribe whatever has not been committed yet."""
+        try:
+            self.ffmpeg.stdin.close()
+        except OSError:
+            pass
+        self.reader.join(timeout=5)
+        self.ffmpeg.wait(timeout=5)
+        with self.busy:   # let an in-flight partial pass land first
+            audio = self._audio(self.committed_at)
+            tail  = ""
+            if len(audio) >= SAMPLE_RATE // 4:
+                tail = " ".join(s["text"].strip() for s in self.transcribe(audio)).strip()
+            return (self.committed + " " + tail).strip()
+
+    def close(self):
+        if self.ffmpeg.poll() is None:
+            self.ffmpeg.kill()
+
+
+class StreamRegistry:
+    """Open sessions by id, with idle ones reaped on each new start."""
+
+    def __init__(self, transcribe):
+        self.transcribe = transcribe
+        self.sessions   = {}
+        self.lock       = threading.Lock()
+
+    def start(self):
+        self.reap()
+        session = StreamSession(self.transcribe)
+        with self.lock:
+            self.sessions[session.id] = session
+        return session
+
+    def get(self, sid):
+        with self.lock:
+            return self.sessions.get(sid)
+
+    def pop(self, sid):
+        with self.lock:
+            return self.sessions.pop(sid, None)
+
+    def reap(self):
+        now = time.time()
+        with self.lock:
+            stale = [sid for sid, s in self.sessions.items() if now - s.touched > SESSION_TTL]
+            for sid in stale:
+                self.sessions.pop(sid).close()
@@ -0,0 +1,200 @@
+# asr/asr_workers.py
+# Multi-process ASR: N worker processes each hold the models, so CPU-bound
+# inference runs on every core instead of queueing behind one GIL.
+#
+# On platforms with fork (Linux/macOS) the parent loads the weights once
+# and the workers inherit them copy-on-write; on Windows (spawn) each
+# worker loads its own copy.
+
+import multiprocessing as mp
+import os, threading, time, itertools
+from concurrent.futures import Future
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+CTX = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context("spawn")
+
+# Backends loaded in the parent before forking — inherited by the workers
+_INHERITED = {}
+
+
+def _worker_main(idx, specs, tasks, results, threads):
+    from asr_backends import load_backend, warmup
+    if threads:
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+    backends = {}
+    for name, spec in specs.items():
+        backends[name] = _INHERITED.get(name) or load_backend(*spec)
+    for b in {id(b): b for b in backends.values()}.values():
+        warmup(b)
+    results.put((idx, None, True, "ready"))
+    while True:
+        job = tasks.get()
+        if job is None:
+            break
+        job_id, name, method, args = job
+        try:
+            results.put((idx, job_id, True, getattr(backends[name], method)(*args)))
+        except Exception as e:
+            results.put((idx, job_id, False, f"{type(e).__name__}: {e}"))
+
+
+def _memory(pid):
+    """(rss, uss) in MB — uss is memory only this process holds, so the
+    gap between the two is roughly what copy-on-write sharing saves."""
+    if psutil is None:
+        return None, None
+    try:
+        p = psutil.Process(pid)
+        try:
+            full = p.memory_full_info()
+            return round(full.rss / 2**20, 1), round(full.uss / 2**20, 1)
+        except (psutil.AccessDenied, AttributeError):
+            return round(p.memory_info().rss / 2**20, 1), None
+    except psutil.Error:
+        return None, None
+
+
+class _Worker:
+    def __init__(self, idx):
+        self.idx      = idx
+        self.process  = None
+        self.tasks    = None
+        self.inflight = {}        # job id → Future
+        self.ready    = False
+        self.done     = 0
+        self.errors   = 0
+        self.restarts = -1
+        self.busy_s   = 0.0
+
+
+class WorkerPool:
+    """Least-loaded dispatch over N model-holding processes.
+
+    `specs` maps a name to load_backend arguments, e.g.
+    {"short": ("whisper", "base", None), "long": ("whisper", "small", None)}.
+    Use pool.backend(name) to get an object with the usual backend methods.
+    """
+
+    def __init__(self, specs, workers=2, preloaded=None, threads_per_worker=None):
+        self.specs   = specs
+        self.threads = threads_per_worker or max(1, (os.cpu_count() or 2) // workers)
+        self.results = CTX.Queue()
+        self.workers = [_Worker(i) for i in range(workers)]
+        self.jobs    = itertools.count()
+        self.started = {}         # job id → submit time
+        self.lock    = threading.Lock()
+        if CTX.get_start_method() == "fork" and preloaded:
+            _INHERITED.update(preloaded)
+        for w in self.workers:
+            self._spawn(w)
+        threading.Thread(target=self._collect, daemon=True, name="asr-pool-results").start()
+        threading.Thread(target=self._monitor, daemon=True, name="asr-pool-monitor").start()
+
+    def _spawn(self, w):
+        w.tasks   = CTX.Queue()
+        w.ready   = False
+        w.restarts += 1
+        w.process = CTX.Process(target=_worker_main, daemon=True,
+                                args=(w.idx, self.specs, w.tasks, self.results, self.threads))
+        w.process.start()
+
+    # ── dispatch ────────────────────────────
+    def submit(self, name, method, *args):
+        fut = Future()
+        with self.lock:
+            alive = [w for w in self.workers if w.process.is_alive()] or self.workers
+            # Prefer warmed-up workers, then the one with the fewest jobs in flight
+            w = min(alive, key=lambda w: (not w.ready, len(w.inflight)))
+            job_id = next(self.jobs)
+            w.inflight[job_id] = fut
+            self.started[job_id] = time.time()
+        w.tasks.put((job_id, name, method, args))
+        return fut
+
+    def call(self, name, method, *args):
+        return self.submit(name, method, *args).result()
+
+    def backend(self, name):
+        return _PoolBackend(self, name)
+
+    def _collect(self):
+        while True:
+            idx, job_id, ok, value = self.results.get()
+            w = self.workers[idx]
+            if job_id is None:
+                w.ready = True
+                print(f"[ASR] Worker {idx} ready (pid {w.process.pid})")
+                continue
+            with self.lock:
+                fut = w.inflight.pop(job_id, None)
+                w.busy_s += time.time() - self.started.pop(job_id, time.time())
+                if ok:
+                    w.done += 1
+                else:
+                    w.errors += 1
+            if fut is None:
+                continue
+            if ok:
+                fut.set_result(value)
+            else:
+                fut.set_exception(RuntimeError(value))
+
+    def _monitor(self):
+        while True:
+            time.sleep(2)
+            for w in self.workers:
+                if w.process.is_alive():
+                    continue
+                print(f"[ASR] Worker {w.idx} died (exit {w.process.exitcode}) — restarting")
+                with self.lock:
+                    lost, w.inflight = w.inflight, {}
+                for job_id, fut in lost.items():
+                    self.started.pop(job_id, None)
+                    fut.set_exception(RuntimeError(f"ASR worker {w.idx} died"))
+                self._spawn(w)
+
+    # ── reporting ───────────────────────────
+    def stats(self):
+        out = []
+        for w in self.workers:
+            rss, uss = _memory(w.process.pid) if w.process.is_alive() else (None, None)
+            out.append({
+                "worker":   w.idx,
+                "pid":      w.process.pid,
+                "alive":    w.process.is_alive(),
+                "ready":    w.ready,
+                "inflight": len(w.inflight),
+                "done":     w.done,
+                "errors":   w.errors,
+                "restarts": w.restarts,
+                "busy_s":   round(w.busy_s, 1),
+                "rss_mb":   rss,
+                "uss_mb":   uss,
+            })
+        return {"start_method": CTX.get_start_method(), "threads_per_worker": self.threads, "workers": out}
+
+
+class _PoolBackend:
+    """Looks like an asr_backends backend, but runs each call on the pool."""
+
+    def __init__(self, pool, name):
+        self.pool = pool
+        self.name = name
+        self.size = pool.specs[name][1]
+
+    def segments(self, audio):
+        return self.pool.call(self.name, "segments", audio)
+
+    def transcribe(self, audio):
+        return self.pool.call(self.name, "transcribe", audio)
+
+    def transcribe_batch(self, clips):
+        return self.pool.call(self.name, "transcribe_batch", clips)
@@ -0,0 +1,51 @@
+# asr/audio_io.py
+# Turns uploaded audio bytes into the float32 16 kHz mono array Whisper
+# wants, without ever writing them to disk.
+
+import io, subprocess, wave
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def decode_ffmpeg(data):
+    """Any container/codec ffmpeg understands (webm/ogg/mp3/...) → float32 samples."""
+    proc = subprocess.run(
+        ["ffmpeg", "-nostdin", "-loglevel", "quiet", "-i", "pipe:0",
+         "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
+        input=data, stdout=subprocess.PIPE, check=True)
+    return pcm16_to_float(proc.stdout)
+
+
+def pcm16_to_float(raw):
+    return np.frombuffer(raw, np.int16).astype(np.float32) / 32768.0
+
+
+def decode_wav(data):
+    """16-bit PCM WAV → float32 samples. Returns None when it needs resampling,
+    so the caller can hand it to ffmpeg instead."""
+    with wave.open(io.BytesIO(data)) as w:
+        if w.getsampwidth() != 2 or w.getframerate() != SAMPLE_RATE:
+            return None
+        audio = pcm16_to_float(w.readframes(w.getnframes()))
+        if w.getnchannels() > 1:
+            audio = audio.reshape(-1, w.getnchannels()).mean(axis=1)
+        return audio
+
+
+def decode_audio(data, fmt=None):
+    """Decode an upload.
+
+    fmt="pcm_s16le" / "pcm_f32le" means raw 16 kHz mono samples — no decode
+    step at all. WAV is sniffed from its header; anything else goes through
+    an ffmpeg pipe.
+    """
+    if fmt == "pcm_s16le":
+        return pcm16_to_float(data)
+    if fmt == "pcm_f32le":
+        return np.frombuffer(data, np.float32).copy()
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        audio = decode_wav(data)
+        if audio is not None:
+            return audio
+    return decode_ffmpeg(data)
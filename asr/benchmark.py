@@ -0,0 +1,86 @@
+# asr/benchmark.py
+# CPU benchmark for the ASR backends: word error rate and real-time factor
+# over a folder of recordings with matching .txt transcripts.
+#
+#   python asr/benchmark.py samples/ whisper:base faster-whisper:base:int8 faster-whisper:small:int8
+#
+# Each recording "clip.wav" (or .webm/.mp3/...) needs a "clip.txt" next to it.
+# RTF = processing time / audio duration, so lower is faster; < 1 is real time.
+
+import os, re, sys, time
+from audio_io import decode_audio, SAMPLE_RATE
+from asr_backends import load_backend, warmup
+
+
+def words(text):
+    return re.sub(r"[^a-z0-9' ]+", " ", text.lower()).split()
+
+
+def word_errors(ref, hyp):
+    """Word-level Levenshtein distance (substitutions + insertions + deletions)."""
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i]
+        for j, h in enumerate(hyp, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h)))
+        prev = cur
+    return prev[-1]
+
+
+def load_samples(folder):
+    samples = []
+    for name in sorted(os.listdir(folder)):
+        base, ext = os.path.splitext(name)
+        ref_path = os.path.join(folder, base + ".txt")
+        if ext == ".txt" or not os.path.exists(ref_path):
+            continue
+        with open(os.path.join(folder, name), "rb") as f:
+            audio = decode_audio(f.read())
+        with open(ref_path, encoding="utf-8") as f:
+            samples.append((name, audio, words(f.read())))
+    return samples
+
+
+def run(spec, samples):
+    name, size, compute = (spec.split(":") + [None, None])[:3]
+    started = time.time()
+    backend = load_backend(name, size or "base", compute)
+    warmup(backend)
+    load_s = time.time() - started
+
+    errors = ref_words = 0
+    audio_s = proc_s = 0.0
+    for _, audio, ref in samples:
+        started = time.time()
+        hyp = words(backend.transcribe(audio))
+        proc_s    += time.time() - started
+        audio_s   += len(audio) / SAMPLE_RATE
+        errors    += word_errors(ref, hyp)
+        ref_words += len(ref)
+    return {
+        "backend": spec,
+        "wer":     errors / ref_words if ref_words else 0.0,
+        "rtf":     proc_s / audio_s if audio_s else 0.0,
+        "load_s":  load_s,
+    }
+
+
+def main(argv):
+    if len(argv) < 2:
+        print(__doc__ or "usage: benchmark.py FOLDER BACKEND[:MODEL[:COMPUTE]] ...")
+        return 1
+    samples = load_samples(argv[0])
+    if not samples:
+        print(f"No recordings with .txt transcripts in {argv[0]}")
+        return 1
+    total = sum(len(a) for _, a, _ in samples) / SAMPLE_RATE
+    print(f"{len(samples)} recordings, {total:.1f}s of audio\n")
+    print(f"{'backend':<32} {'WER':>7} {'RTF':>7} {'load':>7}")
+    for spec in argv[1:]:
+        r = run(spec, samples)
+        print(f"{r['backend']:<32} {r['wer']:>6.1%} {r['rtf']:>7.3f} {r['load_s']:>6.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
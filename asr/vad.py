@@ -0,0 +1,108 @@
+# asr/vad.py
+# Energy-based voice activity detection. Cheap enough to run on every
+# upload before Whisper: trims silence, spots empty recordings and can
+# cut long ones into speech segments.
+
+import threading
+import numpy as np
+
+SAMPLE_RATE   = 16000
+FRAME_MS      = 30
+MIN_SPEECH    = 0.25     # seconds of speech below which a recording counts as empty
+PAD           = 0.2      # seconds kept either side of speech
+MAX_GAP       = 1.0      # internal silences longer than this are shortened to PAD * 2
+FLOOR_DB      = -50.0    # never treat anything quieter than this as speech
+MARGIN_DB     = 12.0     # speech must be this far above the estimated noise floor
+
+
+def frame_energy_db(audio):
+    n = SAMPLE_RATE * FRAME_MS // 1000
+    frames = len(audio) // n
+    if frames == 0:
+        return np.zeros(0)
+    rms = np.sqrt(np.mean(audio[:frames * n].reshape(frames, n) ** 2, axis=1) + 1e-10)
+    return 20 * np.log10(rms)
+
+
+def speech_segments(audio):
+    """[(start_sample, end_sample)] of speech, padded and with short gaps merged."""
+    db = frame_energy_db(audio)
+    if len(db) == 0:
+        return []
+    noise     = np.percentile(db, 10)
+    threshold = max(FLOOR_DB, noise + MARGIN_DB)
+    voiced    = db > threshold
+
+    n, pad = SAMPLE_RATE * FRAME_MS // 1000, int(PAD * SAMPLE_RATE)
+    segments = []
+    start = None
+    for i, v in enumerate(voiced):
+        if v and start is None:
+            start = i
+        elif not v and start is not None:
+            segments.append([start * n, i * n])
+            start = None
+    if start is not None:
+        segments.append([start * n, len(voiced) * n])
+
+    merged = []
+    for s, e in segments:
+        s, e = max(0, s - pad), min(len(audio), e + pad)
+        if merged and s - merged[-1][1] <= MAX_GAP * SAMPLE_RATE:
+            merged[-1][1] = e
+        else:
+            merged.append([s, e])
+    return [(s, e) for s, e in merged]
+
+
+class VadStats:
+    """Running totals of how much audio VAD kept away from Whisper."""
+
+    def __init__(self):
+        self.lock     = threading.Lock()
+        self.requests = 0
+        self.empty    = 0
+        self.input_s  = 0.0
+        self.kept_s   = 0.0
+
+    def record(self, input_s, kept_s):
+        with self.lock:
+            self.requests += 1
+            self.empty    += kept_s == 0
+            self.input_s  += input_s
+            self.kept_s   += kept_s
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "requests":        self.requests,
+                "empty_rejected":  self.empty,
+                "input_seconds":   round(self.input_s, 1),
+                "kept_seconds":    round(self.kept_s, 1),
+                "dropped_percent": round(100 * (1 - self.kept_s / self.input_s), 1) if self.input_s else 0.0,
+            }
+
+
+def trim(audio, split=False):
+    """Apply VAD to one recording.
+
+    Returns (pieces, info). `pieces` is [] for an empty recording, one
+    array with silences trimmed/shortened, or — with split=True — one
+    array per speech segment. `info` says how much audio was dropped.
+    """
+    segments = speech_segments(audio)
+    input_s  = len(audio) / SAMPLE_RATE
+    kept     = sum(e - s for s, e in segments) / SAMPLE_RATE
+    if kept < MIN_SPEECH:
+        pieces, kept = [], 0.0
+    elif split:
+        pieces = [audio[s:e] for s, e in segments]
+    else:
+        pieces = [np.concatenate([audio[s:e] for s, e in segments])]
+    info = {
+        "input_seconds":   round(input_s, 2),
+        "kept_seconds":    round(kept, 2),
+        "dropped_seconds": round(input_s - kept, 2),
+        "segments":        len(segments) if pieces else 0,
+    }
+    return pieces, info
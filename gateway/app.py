@@ -1,18 +1,41 @@
 # gateway/app.py
-import os
-import requests
-from flask import Flask, request, jsonify, send_from_directory
+import os, sys, json
+from flask import Flask, Response, request, jsonify, send_from_directory, send_file, stream_with_context
 from flask_cors import CORS
+from service_client import ServiceClient, LocalService, ServiceUnavailable
 
 app = Flask(__name__)
 CORS(app, origins=["*"])
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-
-ASR_URL    = "http://localhost:5001/transcribe"
-NLP_URL    = "http://localhost:5002/parse"
-TOOL_URL = "http://localhost:5003/execute"
-TTS_URL    = "http://localhost:5004/speak"
-VISION_URL = "http://localhost:5005"
+ROOT_DIR = os.path.dirname(BASE_DIR)
+
+# Monolith mode: every service runs inside this process and is called
+# directly. Set AURA_MODE=monolith or pass --monolith.
+MONOLITH = os.getenv("AURA_MODE", "").lower() == "monolith" or "--monolith" in sys.argv
+
+if MONOLITH:
+    for sub in ("asr", "nlp", "tools", "tts", "vision"):
+        sys.path.insert(0, os.path.join(ROOT_DIR, sub))
+    import asr_service, nlp_service, tool_service, tts_service, vision_service
+
+    ASR    = LocalService("asr",    asr_service.HANDLERS)
+    NLP    = LocalService("nlp",    nlp_service.HANDLERS)
+    TOOLS  = LocalService("tools",  tool_service.HANDLERS)
+    TTS    = LocalService("tts",    tts_service.HANDLERS)
+    VISION = LocalService("vision", vision_service.HANDLERS)
+    AUDIO_URL = "/audio"
+else:
+    # One pooled keep-alive client per downstream service.
+    # Read timeouts are sized for the slowest normal call on each hop.
+    ASR    = ServiceClient("asr",    "http://localhost:5001", read_timeout=60)
+    NLP    = ServiceClient("nlp",    "http://localhost:5002", read_timeout=20)
+    TOOLS  = ServiceClient("tools",  "http://localhost:5003", read_timeout=60)
+    TTS    = ServiceClient("tts",    "http://localhost:5004", read_timeout=20)
+    VISION = ServiceClient("vision", "http://localhost:5005", read_timeout=30)
+    AUDIO_URL = "http://localhost:5004/audio"
+SERVICES = [ASR, NLP, TOOLS, TTS, VISION]
+
+NO_SPEECH = "I didn't hear anything. Try again?"
 
 VISION_TOOLS = {"read_screen", "click_icon", "describe_screen", "desktop_icons", "find_text"}
 @app.route("/<path:path>")
@@ -23,14 +46,15 @@ def static_files(path):
 def home():
     return send_from_directory(".", "index.html")
 
-def run_pipeline(text, use_tts=True):
+def pipeline_stages(text, use_tts=True):
 
-    """Shared pipeline: text → NLP → Tool/Vision → TTS"""
+    """Shared pipeline: text → NLP → Tool/Vision → TTS.
+    Yields (event, data) as each stage finishes so callers can stream it."""
 
     # Step 1: NLP
-    nlp_resp    = requests.post(NLP_URL, json={"text": text})
-    intent_data = nlp_resp.json()
+    intent_data = NLP.post("/parse", json={"text": text}) or {}
     print(f"[NLP] Intent: {intent_data}")
+    yield "intent", intent_data
 
     tool   = intent_data.get("tool", "general")
     params = intent_data.get("params", {})
@@ -38,32 +62,40 @@ def run_pipeline(text, use_tts=True):
     # Step 2: Route to Vision or Tool service
     if tool in VISION_TOOLS:
         endpoint_map = {
-            "read_screen":     f"{VISION_URL}/read_screen",
-            "click_icon":      f"{VISION_URL}/click_icon",
-            "describe_screen": f"{VISION_URL}/describe",
-            "desktop_icons":   f"{VISION_URL}/desktop_icons",
-            "find_text":       f"{VISION_URL}/find_text",
+            "read_screen":     "/read_screen",
+            "click_icon":      "/click_icon",
+            "describe_screen": "/describe",
+            "desktop_icons":   "/desktop_icons",
+            "find_text":       "/find_text",
         }
         if tool == "desktop_icons":
-            resp = requests.get(endpoint_map[tool])
+            resp = VISION.get(endpoint_map[tool])
         else:
-            resp = requests.post(endpoint_map[tool], json=params)
-        result = resp.json().get("result", "Done.")
+            resp = VISION.post(endpoint_map[tool], json=params)
+        result = resp.get("result", "Done.")
     else:
-        resp   = requests.post(TOOL_URL, json=intent_data)
-        result = resp.json()["result"]
+        resp   = TOOLS.post("/execute", json=intent_data)
+        result = resp["result"]
 
     print(f"[RESULT] {str(result)[:150]}")
+    yield "result", {"response": result}
 
-    # Step 3: TTS
-    audio_url = None
-
+    # Step 3: TTS — a TTS outage shouldn't lose the answer, just the audio
     if use_tts:
-        requests.post(TTS_URL, json={"text": str(result)[:500]})
-        audio_url = "http://localhost:5004/audio"
-
-    
+        try:
+            tts_resp = TTS.post("/speak", json={"text": str(result)[:500]})
+            if "error" not in tts_resp:
+                yield "audio", {"audio_url": AUDIO_URL}
+        except ServiceUnavailable as e:
+            print(f"[TTS ERROR] {e}")
 
+def run_pipeline(text, use_tts=True):
+    result, audio_url = None, None
+    for event, data in pipeline_stages(text, use_tts):
+        if event == "result":
+            result = data["response"]
+        elif event == "audio":
+            audio_url = data["audio_url"]
     return result, audio_url
 
 # ── VOICE route (existing) ──────────────────────────────────
@@ -73,9 +105,11 @@ def process():
         audio = request.files.get("audio")
 
         # ASR
-        asr_resp = requests.post(ASR_URL, files={"audio": (audio.filename, audio.read(), "audio/webm")})
-        text = asr_resp.json()["text"]
+        asr_resp = ASR.post("/transcribe", files={"audio": (audio.filename, audio.read(), "audio/webm")})
+        text = asr_resp["text"]
         print(f"[ASR] User said: {text}")
+        if not text:  # VAD found no speech
+            return jsonify({"user_said": "", "response": NO_SPEECH, "audio_url": None})
 
         result, audio_url = run_pipeline(text)
 
@@ -84,6 +118,9 @@ def process():
             "response":  result,
             "audio_url": audio_url
         })
+    except ServiceUnavailable as e:
+        print(f"[ERROR] {e}")
+        return jsonify({"error": str(e), "user_said": "", "response": f"The {e.service} service isn't responding right now."}), 503
     except Exception as e:
         print(f"[ERROR] {e}")
         return jsonify({"error": str(e), "user_said": "", "response": "Something went wrong!"}), 500
@@ -105,10 +142,106 @@ def process_text():
             "response":  result,
             "audio_url": audio_url
         })
+    except ServiceUnavailable as e:
+        print(f"[ERROR] {e}")
+        return jsonify({"error": str(e), "response": f"The {e.service} service isn't responding right now."}), 503
     except Exception as e:
         print(f"[ERROR] {e}")
         return jsonify({"error": str(e), "response": "Something went wrong!"}), 500
 
+# ── STREAMING routes (Server-Sent Events) ──────────────────
+# Same pipeline, but each stage is sent as soon as it finishes:
+# transcript → intent → result → audio → done (or error).
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def stream_pipeline(text=None, audio=None, asr_session=None, use_tts=True):
+    try:
+        if audio is not None or asr_session is not None:
+            if asr_session is not None:
+                asr_resp = ASR.post("/stream/finish", json={"sid": asr_session})
+            else:
+                asr_resp = ASR.post("/transcribe", files={"audio": audio})
+            if "error" in asr_resp:
+                raise ValueError(asr_resp["error"])
+            text = asr_resp["text"]
+            print(f"[ASR] User said: {text}")
+            if not text:  # VAD found no speech
+                yield sse("result", {"response": NO_SPEECH})
+                yield sse("done", {})
+                return
+            yield sse("transcript", {"user_said": text})
+        for event, data in pipeline_stages(text, use_tts):
+            yield sse(event, data)
+        yield sse("done", {})
+    except ServiceUnavailable as e:
+        print(f"[ERROR] {e}")
+        yield sse("error", {"error": str(e), "response": f"The {e.service} service isn't responding right now."})
+    except Exception as e:
+        print(f"[ERROR] {e}")
+        yield sse("error", {"error": str(e), "response": "Something went wrong!"})
+
+def event_stream(gen):
+    # X-Accel-Buffering stops reverse proxies from holding events back
+    return Response(stream_with_context(gen), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route("/process_stream", methods=["POST"])
+def process_stream():
+    audio = request.files.get("audio")
+    if audio is None:
+        return jsonify({"error": "No audio file"}), 400
+    payload = (audio.filename, audio.read(), "audio/webm")
+    return event_stream(stream_pipeline(audio=payload))
+
+# ── LIVE ASR (chunks uploaded while recording) ─────────────
+@app.route("/asr_stream/start", methods=["POST"])
+def asr_stream_start():
+    try:
+        return jsonify(ASR.post("/stream/start"))
+    except ServiceUnavailable as e:
+        return jsonify({"error": str(e)}), 503
+
+@app.route("/asr_stream/chunk", methods=["POST"])
+def asr_stream_chunk():
+    audio = request.files.get("audio")
+    sid   = request.form.get("sid", "")
+    try:
+        return jsonify(ASR.post("/stream/chunk", data={"sid": sid},
+                                files={"audio": ("chunk.webm", audio.read() if audio else b"", "audio/webm")}))
+    except ServiceUnavailable as e:
+        return jsonify({"error": str(e)}), 503
+
+@app.route("/asr_stream/finish", methods=["POST"])
+def asr_stream_finish():
+    sid = (request.get_json(silent=True) or {}).get("sid", "")
+    if not sid:
+        return jsonify({"error": "No stream id"}), 400
+    return event_stream(stream_pipeline(asr_session=sid))
+
+@app.route("/process_text_stream", methods=["POST"])
+def process_text_stream():
+    data = request.get_json() or {}
+    text = data.get("text", "").strip()
+    if not text:
+        return jsonify({"error": "No text provided"}), 400
+    print(f"[TEXT] User typed: {text}")
+    return event_stream(stream_pipeline(text=text, use_tts=False))
+
+# ── TTS AUDIO (monolith mode only — otherwise served on 5004) ──
+@app.route("/audio", methods=["GET"])
+def audio():
+    if not MONOLITH:
+        return jsonify({"error": "Audio is served by the TTS service."}), 404
+    if not os.path.exists(tts_service.AUDIO_PATH):
+        return jsonify({"error": "No audio file found. Call /speak first."}), 404
+    return send_file(tts_service.AUDIO_PATH, mimetype="audio/mpeg")
+
+# ── SERVICE STATUS ──────────────────────────────────────────
+@app.route("/services", methods=["GET"])
+def services():
+    return jsonify({svc.name: svc.stats() for svc in SERVICES})
+
 if __name__ == "__main__":
-    print("Gateway running on port 5000...")
+    print(f"Gateway running on port 5000{' (monolith mode)' if MONOLITH else ''}...")
     app.run(host="0.0.0.0", port=5000, debug=False)
\ No newline at end of file
@@ -10,6 +10,8 @@ let isRecording   = false;
 let isProcessing  = false;
 let mediaRecorder = null;
 let audioChunks   = [];
+let streamId      = null;               // live ASR session, if the gateway gave us one
+let uploadChain   = Promise.resolve();  // keeps chunk uploads in order
 let msgCount      = 0;
 
 // ── INIT ────────────────────────────────────
@@ -104,15 +106,11 @@ async function sendText() {
   isProcessing = true;
 
   try {
-    const res  = await fetch('/process_text', {
+    await streamPipeline('/process_text_stream', {
       method:  'POST',
       headers: { 'Content-Type': 'application/json' },
       body:    JSON.stringify({ text })
-    });
-    const data = await res.json();
-    removeTyping(typingId);
-    addMessage('aura', data.response || data.error || 'No response.', 'text');
-    if (data.audio_url) playAudio(data.audio_url);
+    }, typingId, 'text');
   } catch (err) {
     removeTyping(typingId);
     addMessage(
@@ -139,9 +137,14 @@ async function startRecording() {
     const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
     audioChunks  = [];
     mediaRecorder = new MediaRecorder(stream);
+    streamId      = await startAsrStream();
+    uploadChain   = Promise.resolve();
 
     mediaRecorder.ondataavailable = (e) => {
-      if (e.data.size > 0) audioChunks.push(e.data);
+      if (e.data.size > 0) {
+        audioChunks.push(e.data);
+        if (streamId) uploadChunk(streamId, e.data);
+      }
     };
     mediaRecorder.onstop = handleVoiceData;
     mediaRecorder.start(100);
@@ -185,21 +188,23 @@ async function handleVoiceData() {
 
   isProcessing = true;
 
-  const blob     = new Blob(audioChunks, { type: 'audio/webm' });
-  const formData = new FormData();
-  formData.append('audio', blob, 'voice.webm');
-
   const typingId = showTyping();
 
   try {
-    const res  = await fetch('/process', { method: 'POST', body: formData });
-    const data = await res.json();
-    removeTyping(typingId);
-
-    if (data.user_said) addMessage('user', data.user_said, 'voice');
-    addMessage('aura', data.response || data.error || 'No response.', 'voice');
-    if (data.audio_url) playAudio(data.audio_url);
-
+    if (streamId) {
+      // Audio is already on the server — just wait for the last chunks
+      await uploadChain;
+      await streamPipeline('/asr_stream/finish', {
+        method:  'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body:    JSON.stringify({ sid: streamId })
+      }, typingId, 'voice');
+    } else {
+      const blob     = new Blob(audioChunks, { type: 'audio/webm' });
+      const formData = new FormData();
+      formData.append('audio', blob, 'voice.webm');
+      await streamPipeline('/process_stream', { method: 'POST', body: formData }, typingId, 'voice');
+    }
   } catch (err) {
     removeTyping(typingId);
     addMessage('aura', `Connection error: ${err.message}`, 'voice');
@@ -210,6 +215,107 @@ async function handleVoiceData() {
   document.getElementById('voiceStatus').textContent = 'Click to begin recording';
 }
 
+// ── LIVE ASR UPLOAD ─────────────────────────
+// Recorder chunks go up while the user is still talking, so the
+// transcript is nearly done by the time they click stop.
+async function startAsrStream() {
+  try {
+    const res  = await fetch('/asr_stream/start', { method: 'POST' });
+    const data = await res.json();
+    return data.sid || null;
+  } catch {
+    return null;  // fall back to uploading the whole recording
+  }
+}
+
+function uploadChunk(sid, blob) {
+  uploadChain = uploadChain.then(async () => {
+    const formData = new FormData();
+    formData.append('sid', sid);
+    formData.append('audio', blob, 'chunk.webm');
+    try {
+      const res  = await fetch('/asr_stream/chunk', { method: 'POST', body: formData });
+      const data = await res.json();
+      if (isRecording && data.partial) {
+        document.getElementById('voiceStatus').textContent = `“${data.partial}”`;
+      }
+    } catch {
+      // A lost chunk only costs accuracy; the final pass still runs
+    }
+  });
+}
+
+// ── STREAMING PIPELINE (SSE over fetch) ─────
+// The gateway sends one event per finished stage:
+// transcript → intent → result → audio → done (or error).
+// Each is rendered as it arrives instead of waiting for the whole run.
+async function streamPipeline(url, init, typingId, inputMode) {
+  const res = await fetch(url, init);
+  if (!res.ok || !res.body) {
+    const data = await res.json().catch(() => ({}));
+    removeTyping(typingId);
+    addMessage('aura', data.response || data.error || `Request failed (${res.status}).`, inputMode);
+    return;
+  }
+
+  const reader  = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer    = '';
+  let answered  = false;
+
+  const handle = (event, data) => {
+    if (event === 'transcript') {
+      // Show what was heard above the typing indicator
+      removeTyping(typingId);
+      addMessage('user', data.user_said, 'voice');
+      typingId = showTyping();
+      setTypingStatus(typingId, 'Understanding…');
+    } else if (event === 'intent') {
+      const tools = data.steps ? data.steps.map(s => s.tool).join(', ') : (data.tool || 'general');
+      setTypingStatus(typingId, `Running ${tools}…`);
+    } else if (event === 'result') {
+      removeTyping(typingId);
+      addMessage('aura', data.response || 'No response.', inputMode);
+      answered = true;
+    } else if (event === 'audio') {
+      playAudio(data.audio_url);
+    } else if (event === 'error') {
+      removeTyping(typingId);
+      addMessage('aura', data.response || data.error || 'Something went wrong!', inputMode);
+      answered = true;
+    }
+  };
+
+  while (true) {
+    let chunk;
+    try {
+      chunk = await reader.read();
+    } catch (err) {
+      removeTyping(typingId);  // may be a newer indicator than the caller's
+      throw err;
+    }
+    const { value, done } = chunk;
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // Events are separated by a blank line
+    let split;
+    while ((split = buffer.indexOf('\n\n')) !== -1) {
+      const raw = buffer.slice(0, split);
+      buffer    = buffer.slice(split + 2);
+      let event = 'message', data = '';
+      raw.split('\n').forEach(line => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+      });
+      handle(event, data ? JSON.parse(data) : {});
+    }
+  }
+
+  removeTyping(typingId);
+  if (!answered) addMessage('aura', 'No response.', inputMode);
+}
+
 // ── ORB STATE MANAGER ───────────────────────
 // states: 'idle' | 'listening' | 'processing'
 function setOrbState(state) {
@@ -284,6 +390,18 @@ function showTyping() {
   return id;
 }
 
+function setTypingStatus(id, text) {
+  const el = document.getElementById(id);
+  if (!el) return;
+  let status = el.querySelector('.typing-status');
+  if (!status) {
+    status = document.createElement('span');
+    status.className = 'msg-time typing-status';
+    el.querySelector('.msg-meta').appendChild(status);
+  }
+  status.textContent = text;
+}
+
 function removeTyping(id) {
   const el = document.getElementById(id);
   if (el) el.remove();
@@ -0,0 +1,163 @@
+# gateway/service_client.py
+# Pooled keep-alive HTTP clients for the downstream services, with
+# per-service timeouts and a circuit breaker so a hung service fails fast.
+
+import threading, time
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class ServiceUnavailable(Exception):
+    """Raised when a downstream call fails or its circuit is open."""
+
+    def __init__(self, service, reason):
+        super().__init__(f"{service} service unavailable: {reason}")
+        self.service = service
+        self.reason  = reason
+
+
+class CircuitBreaker:
+    """closed → open after `threshold` consecutive failures; one trial call
+    is let through (half-open) once `reset_after` seconds have passed."""
+
+    def __init__(self, threshold=3, reset_after=15):
+        self.threshold   = threshold
+        self.reset_after = reset_after
+        self.failures    = 0
+        self.opened_at   = None
+        self.trial       = False
+        self.lock        = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.time() - self.opened_at >= self.reset_after:
+            return "half_open"
+        return "open"
+
+    def allow(self):
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.trial:
+                self.trial = True
+                return True
+            return False
+
+    def success(self):
+        with self.lock:
+            self.failures  = 0
+            self.opened_at = None
+            self.trial     = False
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial     = False
+            if self.failures >= self.threshold:
+                self.opened_at = time.time()
+
+
+class ServiceClient:
+    """One downstream service: a shared Session, its timeouts and its breaker."""
+
+    def __init__(self, name, base_url, connect_timeout=2, read_timeout=30, pool_size=8):
+        self.name     = name
+        self.base_url = base_url.rstrip("/")
+        self.timeout  = (connect_timeout, read_timeout)
+        self.breaker  = CircuitBreaker()
+        self.session  = requests.Session()
+        # pool_block keeps us at pool_size sockets instead of opening extras under load
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.calls    = 0
+        self.errors   = 0
+        self.total_ms = 0.0
+
+    def request(self, method, path, **kwargs):
+        if not self.breaker.allow():
+            raise ServiceUnavailable(self.name, "circuit open")
+        kwargs.setdefault("timeout", self.timeout)
+        started = time.time()
+        try:
+            resp = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+            if resp.status_code >= 500:
+                raise ServiceUnavailable(self.name, f"HTTP {resp.status_code}")
+            data = resp.json()
+        except ServiceUnavailable:
+            self.errors += 1
+            self.breaker.failure()
+            raise
+        except (requests.RequestException, ValueError) as e:
+            self.errors += 1
+            self.breaker.failure()
+            raise ServiceUnavailable(self.name, f"{type(e).__name__}: {e}") from e
+        finally:
+            self.calls    += 1
+            self.total_ms += (time.time() - started) * 1000
+        self.breaker.success()
+        return data
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def stats(self):
+        return {
+            "url":     self.base_url,
+            "state":   self.breaker.state,
+            "calls":   self.calls,
+            "errors":  self.errors,
+            "avg_ms":  round(self.total_ms / self.calls, 1) if self.calls else None,
+            "timeout": {"connect": self.timeout[0], "read": self.timeout[1]},
+        }
+
+
+class LocalService:
+    """Same interface as ServiceClient, but calls a service's HANDLERS
+    directly in this interpreter — no sockets, no JSON round trip."""
+
+    def __init__(self, name, handlers):
+        self.name     = name
+        self.handlers = handlers
+        self.calls    = 0
+        self.errors   = 0
+        self.total_ms = 0.0
+
+    def request(self, method, path, json=None, files=None, data=None, **_):
+        handler = self.handlers.get(path)
+        if handler is None:
+            raise ServiceUnavailable(self.name, f"no handler for {path}")
+        payload = dict(json or {})
+        payload.update(data or {})
+        for key, value in (files or {}).items():
+            # requests-style (filename, bytes, mimetype) tuples → raw bytes
+            payload[key] = value[1] if isinstance(value, tuple) else value
+        started = time.time()
+        try:
+            return handler(payload)
+        except Exception as e:
+            self.errors += 1
+            raise ServiceUnavailable(self.name, f"{type(e).__name__}: {e}") from e
+        finally:
+            self.calls    += 1
+            self.total_ms += (time.time() - started) * 1000
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def stats(self):
+        return {
+            "url":    "in-process",
+            "state":  "local",
+            "calls":  self.calls,
+            "errors": self.errors,
+            "avg_ms": round(self.total_ms / self.calls, 1) if self.calls else None,
+        }
@@ -0,0 +1,246 @@
+# llm/llm_provider.py
+# One place for every chat-completion call AURA makes. NLP and vision both
+# go through get_provider(), so a process holds a single pooled client and
+# the retry / hedging policy is the same everywhere.
+#
+#   LLM_PROVIDER=groq    hosted Groq API (default, needs GROQ_API_KEY)
+#   LLM_PROVIDER=local   OpenAI-compatible server at LLM_BASE_URL — the
+#                        stand-in in llm/llm_standin.py, or a local model
+#                        behind llama.cpp / Ollama / vLLM
+
+import os, random, threading, time, json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed
+
+TRANSIENT_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """A failed request; status is None when the server never answered."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+def is_transient(exc):
+    """Worth retrying: rate limits, 5xx, dropped connections, timeouts."""
+    if isinstance(exc, LLMError) and exc.status is None:
+        return True
+    status = getattr(exc, "status", None) or getattr(exc, "status_code", None)
+    if status is not None:
+        return status in TRANSIENT_STATUS
+    name = type(exc).__name__
+    return any(k in name for k in ("Connection", "Timeout", "RateLimit", "InternalServer"))
+
+
+class _Backend:
+    """Transport only: one attempt, no retries."""
+
+    def complete(self, messages, model, temperature, max_tokens):
+        raise NotImplementedError
+
+    def stream(self, messages, model, temperature, max_tokens):
+        """Generator of text deltas; closing it closes the connection."""
+        raise NotImplementedError
+
+
+def _body(messages, model, temperature, max_tokens, **extra):
+    # None means "the server's default" — leave the field out
+    body = {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens, **extra}
+    return {k: v for k, v in body.items() if v is not None}
+
+
+class GroqBackend(_Backend):
+
+    def __init__(self, api_key, timeout):
+        from groq import Groq
+        # Retries are ours, so the SDK shouldn't add its own on top
+        self.client = Groq(api_key=api_key, max_retries=0, timeout=timeout)
+
+    def complete(self, messages, model, temperature, max_tokens):
+        response = self.client.chat.completions.create(**_body(messages, model, temperature, max_tokens))
+        return response.choices[0].message.content
+
+    def stream(self, messages, model, temperature, max_tokens):
+        response = self.client.chat.completions.create(
+            **_body(messages, model, temperature, max_tokens, stream=True))
+        try:
+            for chunk in response:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            response.close()
+
+
+class HTTPBackend(_Backend):
+    """Any server speaking the OpenAI /chat/completions shape."""
+
+    def __init__(self, base_url, api_key, timeout, pool_size):
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.url     = base_url.rstrip("/") + "/chat/completions"
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.mount("http://",  HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+    def _post(self, body, stream=False):
+        import requests
+        try:
+            r = self.session.post(self.url, json=body, timeout=self.timeout, stream=stream)
+        except requests.RequestException as e:
+            raise LLMError(f"{type(e).__name__}: {e}") from e
+        if r.status_code >= 400:
+            r.close()
+            raise LLMError(f"HTTP {r.status_code}", status=r.status_code)
+        return r
+
+    def complete(self, messages, model, temperature, max_tokens):
+        return self._post(_body(messages, model, temperature, max_tokens)).json()["choices"][0]["message"]["content"]
+
+    def stream(self, messages, model, temperature, max_tokens):
+        r = self._post(_body(messages, model, temperature, max_tokens, stream=True), stream=True)
+        try:
+            for line in r.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or []
+                delta = choices[0].get("delta", {}).get("content") if choices else None
+                if delta:
+                    yield delta
+        finally:
+            r.close()
+
+
+class Provider:
+    """Retries with full-jitter exponential backoff, and hedging: if an
+    attempt hasn't answered (or, when streaming, produced its first token)
+    after `hedge_after` seconds, a second identical request is sent and
+    whichever finishes first wins. hedge_after=0 turns hedging off."""
+
+    def __init__(self, backend, name, model, retries=2, backoff=0.25, hedge_after=0.0, pool_size=8):
+        self.backend     = backend
+        self.name        = name
+        self.model       = model
+        self.retries     = retries
+        self.backoff     = backoff
+        self.hedge_after = hedge_after
+        self.pool        = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="llm")
+        self.lock        = threading.Lock()
+        self.latencies   = deque(maxlen=500)
+        self.counts      = {"calls": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "errors": 0}
+
+    # ── policy ──────────────────────────────
+    def _count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def _hedged(self, fn, discard=None):
+        if not self.hedge_after:
+            return fn()
+        first = self.pool.submit(fn)
+        if wait([first], timeout=self.hedge_after).done:
+            return first.result()
+        self._count("hedges")
+        second  = self.pool.submit(fn)
+        futures = [first, second]
+        error   = None
+        for f in as_completed(futures):
+            try:
+                value = f.result()
+            except Exception as e:
+                error = error or e
+                continue
+            if f is second:
+                self._count("hedge_wins")
+            loser = first if f is second else second
+            if discard:
+                loser.add_done_callback(lambda o: o.exception() is None and discard(o.result()))
+            return value
+        raise error
+
+    def _call(self, fn, discard=None):
+        started = time.time()
+        self._count("calls")
+        for attempt in range(self.retries + 1):
+            try:
+                value = self._hedged(fn, discard)
+                with self.lock:
+                    self.latencies.append((time.time() - started) * 1000)
+                return value
+            except Exception as e:
+                if attempt == self.retries or not is_transient(e):
+                    self._count("errors")
+                    raise
+                self._count("retries")
+                delay = random.uniform(0, self.backoff * 2 ** attempt)
+                print(f"[LLM] {self.name}: {type(e).__name__} — retrying in {delay * 1000:.0f}ms")
+                time.sleep(delay)
+
+    # ── public ──────────────────────────────
+    def complete(self, messages, model=None, temperature=None, max_tokens=300):
+        """Full reply text."""
+        return self._call(lambda: self.backend.complete(messages, model or self.model, temperature, max_tokens))
+
+    def stream(self, messages, model=None, temperature=None, max_tokens=300):
+        """Generator of text deltas. Retries and hedging cover the wait for
+        the first token; once text is flowing the stream is used as is."""
+        def open_stream():
+            gen = self.backend.stream(messages, model or self.model, temperature, max_tokens)
+            return gen, next(gen, "")
+        gen, first = self._call(open_stream, discard=lambda pair: pair[0].close())
+        try:
+            if first:
+                yield first
+            yield from gen
+        finally:
+            gen.close()
+
+    def stats(self):
+        with self.lock:
+            lat = sorted(self.latencies)
+            return {
+                "provider": self.name,
+                "model":    self.model,
+                **self.counts,
+                "hedge_after_ms": round(self.hedge_after * 1000),
+                "p50_ms": round(lat[len(lat) // 2], 1) if lat else None,
+                "p95_ms": round(lat[int(len(lat) * 0.95)], 1) if lat else None,
+            }
+
+
+_PROVIDER = None
+_PROVIDER_LOCK = threading.Lock()
+
+
+def get_provider():
+    """The process-wide provider, built from the environment on first use."""
+    global _PROVIDER
+    with _PROVIDER_LOCK:
+        if _PROVIDER is None:
+            name    = os.getenv("LLM_PROVIDER", "groq").lower()
+            timeout = float(os.getenv("LLM_TIMEOUT", "30"))
+            pool    = int(os.getenv("LLM_POOL_SIZE", "8"))
+            if name == "groq":
+                backend = GroqBackend(os.getenv("GROQ_API_KEY"), timeout)
+            elif name == "local":
+                backend = HTTPBackend(os.getenv("LLM_BASE_URL", "http://localhost:5010/v1"),
+                                      os.getenv("LLM_API_KEY"), timeout, pool)
+            else:
+                raise ValueError(f"Unknown LLM_PROVIDER '{name}' (use groq or local)")
+            _PROVIDER = Provider(
+                backend, name,
+                model=os.getenv("LLM_MODEL", "llama-3.3-70b-versatile"),
+                retries=int(os.getenv("LLM_RETRIES", "2")),
+                backoff=float(os.getenv("LLM_BACKOFF_MS", "250")) / 1000,
+                hedge_after=float(os.getenv("LLM_HEDGE_MS", "0")) / 1000,
+                pool_size=pool,
+            )
+            print(f"[LLM] Provider: {name} ({_PROVIDER.model})")
+        return _PROVIDER
@@ -0,0 +1,122 @@
+# llm/llm_standin.py
+# Offline stand-in for the hosted LLM. Speaks the OpenAI /chat/completions
+# shape (plain and streamed), answers deterministically, and sleeps for a
+# configurable time so the pipeline can be load-tested without a network.
+#
+#   python llm/llm_standin.py --latency-ms 300 --token-ms 8 --jitter-ms 50
+#   LLM_PROVIDER=local python start/run_all.py
+#
+# Intent prompts are answered with nlp/intent_rules where a rule matches
+# and a "general" reply otherwise; vision prompts get a fixed description.
+# Replies depend only on the request; delays and failures on --seed.
+
+import argparse, json, os, random, re, sys, time
+from flask import Flask, Response, request, jsonify
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "nlp"))
+try:
+    import intent_rules
+except ImportError:
+    intent_rules = None
+
+app = Flask(__name__)
+
+CONFIG = {
+    "latency_ms": float(os.getenv("STANDIN_LATENCY_MS", "300")),   # time to first token
+    "token_ms":   float(os.getenv("STANDIN_TOKEN_MS", "5")),       # per streamed token
+    "jitter_ms":  float(os.getenv("STANDIN_JITTER_MS", "0")),
+    "error_rate": float(os.getenv("STANDIN_ERROR_RATE", "0")),     # fraction answered with a 503
+}
+STATS = {"requests": 0, "streamed": 0, "errors": 0}
+
+# Delays and injected failures come from one seeded generator, so a run
+# with the same --seed and the same traffic behaves the same way
+RNG = random.Random(int(os.getenv("STANDIN_SEED", "0")))
+
+
+def _intent(text):
+    if intent_rules:
+        result = intent_rules.match(text)
+        if result:
+            return result
+    return {"intent": "general", "tool": "general", "params": {"response": f"(stand-in) You said: {text}"}}
+
+
+def _text(content):
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if part.get("type") == "text")
+    return content or ""
+
+
+def answer(messages):
+    system = next((_text(m["content"]) for m in messages if m["role"] == "system"), "")
+    user   = _text(messages[-1]["content"])
+    has_image = any(isinstance(m["content"], list) and any(p.get("type") == "image_url" for p in m["content"])
+                    for m in messages)
+    if has_image:
+        if '"found"' in user:
+            return json.dumps({"found": False, "x": 0, "y": 0, "description": "stand-in cannot see the screen"})
+        return "A desktop with a few application windows open (stand-in description)."
+    if "numbered list of commands" in system:
+        items = re.findall(r'^(\d+)\. "(.*)"$', user, re.M)
+        return json.dumps([{"id": int(n), **_intent(t)} for n, t in items])
+    if "intent parser" in system:
+        m = re.search(r'User said: "(.*)"', user, re.S)
+        return json.dumps(_intent(m.group(1) if m else user))
+    return f"(stand-in) {user[:200]}"
+
+
+def _pieces(text, size=4):
+    # ~4 characters per token
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@app.route('/v1/chat/completions', methods=['POST'])
+def completions():
+    body = request.get_json()
+    STATS["requests"] += 1
+    time.sleep(max(0.0, CONFIG["latency_ms"] + RNG.uniform(-1, 1) * CONFIG["jitter_ms"]) / 1000)
+    if RNG.random() < CONFIG["error_rate"]:
+        STATS["errors"] += 1
+        return jsonify({"error": {"message": "stand-in overloaded"}}), 503
+
+    text  = answer(body.get("messages", []))
+    model = body.get("model", "standin")
+    if not body.get("stream"):
+        return jsonify({
+            "id": "standin", "object": "chat.completion", "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": text}}],
+        })
+
+    STATS["streamed"] += 1
+
+    def events():
+        for piece in _pieces(text):
+            chunk = {"id": "standin", "object": "chat.completion.chunk", "model": model,
+                     "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+            time.sleep(CONFIG["token_ms"] / 1000)
+        yield "data: [DONE]\n\n"
+    return Response(events(), mimetype='text/event-stream')
+
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    return jsonify({**STATS, "config": CONFIG})
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Deterministic offline LLM stand-in")
+    parser.add_argument("--port",       type=int,   default=5010)
+    parser.add_argument("--latency-ms", type=float, default=CONFIG["latency_ms"])
+    parser.add_argument("--token-ms",   type=float, default=CONFIG["token_ms"])
+    parser.add_argument("--jitter-ms",  type=float, default=CONFIG["jitter_ms"])
+    parser.add_argument("--error-rate", type=float, default=CONFIG["error_rate"])
+    parser.add_argument("--seed",       type=int,   default=int(os.getenv("STANDIN_SEED", "0")))
+    args = parser.parse_args()
+    RNG.seed(args.seed)
+    CONFIG.update(latency_ms=args.latency_ms, token_ms=args.token_ms,
+                  jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+    print(f"[STANDIN] Listening on {args.port} with {CONFIG}")
+    app.run(port=args.port, debug=False, threaded=True)
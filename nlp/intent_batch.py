@@ -0,0 +1,71 @@
+# nlp/intent_batch.py
+# Packs many utterances into one LLM request: a numbered list in, a JSON
+# array of intents out. Chunks are sized so the commands plus the answers
+# fit comfortably in the context window.
+
+import json
+from tool_retrieval import CATALOG, HEADER, render
+
+BATCH_HEADER = HEADER.replace("Return ONLY a raw JSON object",
+                              "You will get a numbered list of commands. Return ONLY a raw JSON array")
+BATCH_FOOTER = """
+Return ONLY a raw JSON array with exactly one object per command, in the same order,
+each with an extra "id" field holding the command's number, e.g.
+[{"id":1,"intent":"get_time","tool":"get_time","params":{}}, ...]
+Nothing else."""
+
+# Every tool is listed — the prompt is paid for once per chunk, not per command
+BATCH_PROMPT = render(list(CATALOG), BATCH_HEADER, BATCH_FOOTER)
+
+# Rough output budget per command (~4 characters per token)
+TOKENS_PER_ITEM = 80
+
+
+def chunks(texts, max_items=25, max_chars=4000):
+    """Split [(index, text)] into lists that respect both limits."""
+    batch, size = [], 0
+    for idx, text in texts:
+        if batch and (len(batch) >= max_items or size + len(text) > max_chars):
+            yield batch
+            batch, size = [], 0
+        batch.append((idx, text))
+        size += len(text) + 8
+    if batch:
+        yield batch
+
+
+def user_message(batch):
+    return "\n".join(f'{n}. "{text}"' for n, (_, text) in enumerate(batch, 1))
+
+
+def _valid(item):
+    if not isinstance(item, dict) or not isinstance(item.get("tool"), str):
+        return False
+    return isinstance(item.get("params"), dict) or isinstance(item.get("steps"), list)
+
+
+def align(raw, batch):
+    """Map the model's reply back onto `batch` → {index: intent}. Items that
+    are missing or malformed are simply left out so the caller can retry
+    them one by one."""
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.split("```")[1]
+        if raw.startswith("json"):
+            raw = raw[4:]
+    try:
+        items = json.loads(raw.strip())
+    except ValueError:
+        return {}
+    if isinstance(items, dict):
+        items = items.get("results") or items.get("intents") or []
+    if not isinstance(items, list):
+        return {}
+    out = {}
+    by_id = all(isinstance(i, dict) and isinstance(i.get("id"), int) for i in items)
+    for pos, item in enumerate(items):
+        n = item["id"] - 1 if by_id else pos
+        if 0 <= n < len(batch) and _valid(item):
+            intent = {k: v for k, v in item.items() if k != "id"}
+            out[batch[n][0]] = intent
+    return out
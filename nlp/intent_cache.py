@@ -0,0 +1,152 @@
+# nlp/intent_cache.py
+# Memoizes LLM intent results. Keys are normalized commands, entries
+# expire after a TTL, the least recently used go first when full, and
+# near-identical phrasings can reuse an entry through character-trigram
+# TF-IDF similarity.
+
+import json, math, os, re, threading, time
+from collections import Counter, OrderedDict
+from intent_rules import normalize
+
+_WORD = re.compile(r"[a-z0-9.]+")
+
+
+def trigrams(text):
+    t = f"  {text} "
+    return Counter(t[i:i + 3] for i in range(len(t) - 2))
+
+
+def _slots(key):
+    """Words that carry a value (file names, numbers) — these must match
+    exactly for a fuzzy hit, or 'read notes1.txt' would answer 'read notes2.txt'."""
+    return {w for w in _WORD.findall(key) if any(c.isdigit() for c in w) or '.' in w}
+
+
+class IntentCache:
+
+    def __init__(self, max_size=512, ttl=24 * 3600, path=None, similarity=0.88):
+        self.max_size   = max_size
+        self.ttl        = ttl
+        self.path       = path
+        self.similarity = similarity
+        self.entries    = OrderedDict()   # key → (intent, stored_at)
+        self.grams      = {}              # key → trigram Counter
+        self.df         = Counter()       # trigram → number of keys containing it
+        self.lock       = threading.Lock()
+        self.hits       = 0
+        self.fuzzy_hits = 0
+        self.misses     = 0
+        self.dirty      = False
+        self.saved_at   = 0.0
+        if path:
+            self._load()
+
+    # ── bookkeeping ─────────────────────────
+    def _add(self, key, intent, stored_at):
+        if key in self.entries:
+            self._drop(key)
+        self.entries[key] = (intent, stored_at)
+        self.grams[key]   = trigrams(key)
+        self.df.update(self.grams[key].keys())
+        while len(self.entries) > self.max_size:
+            self._drop(next(iter(self.entries)))
+
+    def _drop(self, key):
+        self.entries.pop(key, None)
+        grams = self.grams.pop(key, None)
+        if grams:
+            self.df.subtract(grams.keys())
+
+    def _expired(self, stored_at):
+        return time.time() - stored_at > self.ttl
+
+    # ── similarity ──────────────────────────
+    def _vector(self, grams):
+        n = len(self.entries) + 1
+        vec = {g: c * math.log(n / (1 + self.df.get(g, 0))) + 1e-9 for g, c in grams.items()}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        return {g: v / norm for g, v in vec.items()}
+
+    def _closest(self, key):
+        q = self._vector(trigrams(key))
+        slots, verb = _slots(key), key.split(' ', 1)[0]
+        best, best_key = 0.0, None
+        for k in self.entries:
+            if k.split(' ', 1)[0] != verb or _slots(k) != slots:
+                continue
+            v = self._vector(self.grams[k])
+            score = sum(w * v.get(g, 0.0) for g, w in q.items())
+            if score > best:
+                best, best_key = score, k
+        return (best_key, best) if best >= self.similarity else (None, best)
+
+    # ── public ──────────────────────────────
+    def get(self, text):
+        """(intent, how) where how is 'exact' / 'fuzzy', or (None, None)."""
+        key = normalize(text)
+        with self.lock:
+            hit = self.entries.get(key)
+            if hit and not self._expired(hit[1]):
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return hit[0], "exact"
+            if hit:
+                self._drop(key)
+            match, _ = self._closest(key) if self.similarity < 1 else (None, 0)
+            if match and not self._expired(self.entries[match][1]):
+                self.entries.move_to_end(match)
+                self.fuzzy_hits += 1
+                return self.entries[match][0], "fuzzy"
+            self.misses += 1
+            return None, None
+
+    def put(self, text, intent):
+        key = normalize(text)
+        with self.lock:
+            self._add(key, intent, time.time())
+            self.dirty = True
+        self._maybe_save()
+
+    def stats(self, llm_avg_ms=None):
+        with self.lock:
+            lookups = self.hits + self.fuzzy_hits + self.misses
+            served  = self.hits + self.fuzzy_hits
+            return {
+                "size":       len(self.entries),
+                "max_size":   self.max_size,
+                "hits":       self.hits,
+                "fuzzy_hits": self.fuzzy_hits,
+                "misses":     self.misses,
+                "hit_rate":   round(served / lookups, 3) if lookups else 0.0,
+                "saved_ms_estimate": round(served * llm_avg_ms) if llm_avg_ms else None,
+                "persistent": bool(self.path),
+            }
+
+    # ── persistence ─────────────────────────
+    def flush(self):
+        self._maybe_save(min_interval=0)
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            return
+        for key, intent, stored_at in rows:
+            if not self._expired(stored_at):
+                self._add(key, intent, stored_at)
+        print(f"[NLP] Loaded {len(self.entries)} cached intents")
+
+    def _maybe_save(self, min_interval=5):
+        if not self.path or not self.dirty or time.time() - self.saved_at < min_interval:
+            return
+        with self.lock:
+            rows = [[k, intent, t] for k, (intent, t) in self.entries.items()]
+            self.dirty, self.saved_at = False, time.time()
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(rows, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[NLP] Could not save intent cache: {e}")
@@ -0,0 +1,156 @@
+# nlp/intent_rules.py
+# Local fast path for commands that don't need an LLM to understand.
+# Every rule is anchored to the whole utterance, so anything with extra
+# detail or ambiguity falls through to Groq.
+
+import re, threading
+
+APPS = [
+    'google chrome', 'chrome', 'notepad', 'calculator', 'paint', 'file explorer',
+    'explorer', 'vs code', 'vscode', 'spotify', 'task manager', 'cmd', 'terminal',
+    'word', 'excel', 'powerpoint',
+]
+FOLDERS = ['desktop', 'downloads', 'documents', 'pictures', 'music', 'videos']
+SYSTEM  = {
+    'ram': 'ram', 'memory': 'ram', 'cpu': 'cpu', 'processor': 'cpu', 'disk': 'disk',
+    'storage': 'disk', 'disk space': 'disk', 'battery': 'battery', 'system': 'system',
+}
+
+_APPS    = '|'.join(re.escape(a) for a in APPS)
+_FOLDERS = '|'.join(FOLDERS)
+_SYSTEM  = '|'.join(re.escape(k) for k in sorted(SYSTEM, key=len, reverse=True))
+_FILE    = r'(?P<file>[\w\-. ]+\.[a-z0-9]{1,5})'
+
+# Filler that never changes the meaning of a command
+_FILLER = re.compile(r"^(hey |ok |okay )?(aura[, ]+)?(please |can you |could you |would you )*|( please| for me| now)+$")
+
+
+def normalize(text):
+    t = text.strip().lower()
+    t = re.sub(r"[?!.,]+$", "", t)
+    t = re.sub(r"\s+", " ", t)
+    return _FILLER.sub("", t).strip()
+
+
+def _intent(tool, **params):
+    return {"intent": tool, "tool": tool, "params": params}
+
+
+_UP_DOWN = {'up': 'up', 'down': 'down', 'increase': 'up', 'raise': 'up', 'decrease': 'down', 'lower': 'down'}
+
+RULES = [
+    (r"what('s| is) the time|what time is it|tell me the time|current time|"
+     r"what('s| is) (the|today's) date|what day is it( today)?|what('s| is) today",
+     lambda m: _intent('get_time')),
+
+    (rf"(open|launch|start|run) (the )?(?P<app>{_APPS})( app)?",
+     lambda m: _intent('open_app', target=m.group('app'))),
+    (rf"(close|quit|exit|kill) (the )?(?P<app>{_APPS})( app)?",
+     lambda m: _intent('close_app', target=m.group('app'))),
+
+    (r"(turn |put )?(the )?volume (?P<dir>up|down)( by (?P<amount>\d+))?|"
+     r"turn (?P<dir2>up|down) (the )?volume( by (?P<amount2>\d+))?",
+     lambda m: _intent('volume', action=m.group('dir') or m.group('dir2'),
+                       amount=int(m.group('amount') or m.group('amount2') or 5))),
+    (r"(?P<verb>increase|raise|decrease|lower) (the )?volume( by (?P<amount>\d+))?",
+     lambda m: _intent('volume', action=_UP_DOWN[m.group('verb')], amount=int(m.group('amount') or 5))),
+    (r"(mute|unmute)( the)?( volume| sound| audio)?",
+     lambda m: _intent('volume', action='mute')),
+
+    (rf"(show|list)( me)?( my| the)? (?P<folder>{_FOLDERS})( files| folder)?",
+     lambda m: _intent('list_files', path=m.group('folder'))),
+    (r"(show|list)( me)?( the| my)? desktop icons",
+     lambda m: _intent('desktop_icons')),
+
+    (rf"(what('s| is) )?(my |the )?(?P<what>{_SYSTEM})( usage| level| status| info| space)?",
+     lambda m: _intent('system_info', query=SYSTEM[m.group('what')])),
+    (r"(show )?(system info|system information|specs)",
+     lambda m: _intent('system_info', query='all')),
+
+    (r"take a screenshot|screenshot",
+     lambda m: _intent('keyboard', action='screenshot')),
+    (r"press (?P<mod>ctrl|control|alt|shift|win)[ +](?P<key>[a-z0-9]|f\d{1,2}|tab|enter|delete)",
+     lambda m: _intent('keyboard', action='hotkey',
+                       keys=f"{'ctrl' if m.group('mod') == 'control' else m.group('mod')}+{m.group('key')}")),
+    (r"press (?P<key>enter|escape|esc|tab|space|backspace)",
+     lambda m: _intent('keyboard', action='press', key=m.group('key'))),
+
+    (r"what('s| is) on (my |the )?screen|what do you see",
+     lambda m: _intent('read_screen', question='what do you see?')),
+
+    (rf"read {_FILE}",          lambda m: _intent('read_file', path=m.group('file'))),
+    (rf"delete {_FILE}",        lambda m: _intent('delete_file', path=m.group('file'))),
+    (rf"(find|locate) {_FILE}", lambda m: _intent('find_file', name=m.group('file'))),
+    (rf"(create|make) {_FILE}", lambda m: _intent('create_file', path=m.group('file'), content='')),
+
+    # Plain web searches — anything mentioning files/folders goes to the LLM
+    (r"(search|google|look up)( for| the web for)? (?P<q>(?!.*\b(folder|file|explorer|directory)\b).+)",
+     lambda m: _intent('web_search', query=m.group('q'))),
+]
+RULES = [(re.compile(rf"^(?:{pattern})$"), build) for pattern, build in RULES]
+
+
+class RuleStats:
+    """How much traffic the rules keep away from the LLM."""
+
+    def __init__(self):
+        self.lock    = threading.Lock()
+        self.hits    = 0
+        self.misses  = 0
+        self.by_tool = {}
+
+    def record(self, result):
+        with self.lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self.by_tool[result['tool']] = self.by_tool.get(result['tool'], 0) + 1
+
+    def snapshot(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits":     self.hits,
+                "misses":   self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "by_tool":  dict(self.by_tool),
+            }
+
+
+def _match_one(t):
+    for pattern, build in RULES:
+        m = pattern.match(t)
+        if m:
+            return build(m)
+    return None
+
+
+# "x and y" runs both at once. "x then y" only waits for x when y acts on
+# whatever is on screen — "open notepad then press ctrl+s" — since a rule
+# step never uses an earlier step's result.
+_JOIN = re.compile(r"(,? (?:and then|then|and also|and|also) |, )")
+_ON_SCREEN = {'keyboard', 'mouse', 'window', 'close_app', 'read_screen', 'click_icon'}
+
+
+def _match_compound(t):
+    parts = _JOIN.split(t)
+    if len(parts) < 3:
+        return None
+    steps = []
+    for n, i in enumerate(range(0, len(parts), 2), 1):
+        intent = _match_one(normalize(parts[i]))
+        if intent is None:
+            return None
+        step = {"id": n, "tool": intent["tool"], "params": intent["params"]}
+        if i and "then" in parts[i - 1] and step["tool"] in _ON_SCREEN:
+            step["after"] = [n - 1]
+        steps.append(step)
+    return {"intent": "plan", "tool": "plan", "steps": steps}
+
+
+def match(text):
+    """Intent for `text` if a rule matches the whole command, or every part
+    of a compound one ("what's my ram and what time is it"), else None."""
+    t = normalize(text)
+    return _match_one(t) or _match_compound(t)
@@ -0,0 +1,69 @@
+# nlp/json_stream.py
+# Incremental parser for an intent streamed token by token. It watches
+# brace depth (ignoring braces inside strings) and reports the intent the
+# moment "tool" and a complete "params" object are on the wire, so the
+# caller can stop reading the completion there.
+
+import json
+
+
+class IntentStreamParser:
+
+    def __init__(self):
+        self.buf      = ""      # text from the first '{' onwards
+        self.started  = False
+        self.depth    = 0
+        self.in_str   = False
+        self.escape   = False
+        self.result   = None
+
+    def feed(self, chunk):
+        """Add streamed text; returns the intent dict once it is complete, else None."""
+        if self.result is not None:
+            return self.result
+        for ch in chunk:
+            if not self.started:
+                if ch != '{':
+                    continue           # skip ``` fences / "json" / whitespace
+                self.started = True
+            self.buf += ch
+            if self.in_str:
+                if self.escape:
+                    self.escape = False
+                elif ch == '\\':
+                    self.escape = True
+                elif ch == '"':
+                    self.in_str = False
+                continue
+            if ch == '"':
+                self.in_str = True
+            elif ch == '{':
+                self.depth += 1
+            elif ch == '}':
+                self.depth -= 1
+                # A nested value just closed, or the whole object did
+                if self.depth <= 1 and self._try_finish():
+                    return self.result
+        return None
+
+    def _try_finish(self):
+        text = self.buf if self.depth == 0 else self.buf + "}"
+        try:
+            obj = json.loads(text)
+        except ValueError:
+            return False
+        # A plan is only done when its steps are, i.e. at the final brace
+        early = obj.get("tool") not in (None, "plan") and "steps" not in obj
+        if self.depth == 0 or (early and isinstance(obj.get("params"), dict)):
+            self.result = obj
+            return True
+        return False
+
+    def finish(self):
+        """Best effort at the end of the stream (e.g. max_tokens cut it short)."""
+        if self.result is None and self.buf:
+            try:
+                self.result = json.loads(self.buf + "}" * max(self.depth, 0))
+            except ValueError:
+                pass
+        return self.result
@@ -1,11 +1,18 @@
 from flask import Flask, request, jsonify
-from groq import Groq
-import os, json
+import os, sys, json, time, atexit
 from dotenv import load_dotenv
+import intent_rules
+from intent_cache import IntentCache
+from tool_retrieval import ToolRetriever
+from json_stream import IntentStreamParser
+import intent_batch
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "llm"))
+from llm_provider import get_provider
 
 load_dotenv()
 app = Flask(__name__)
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+LLM = get_provider()
 
 SYSTEM_PROMPT = """You are AURA's intent parser. Return ONLY a raw JSON object, no markdown, no explanation.
 
@@ -19,6 +26,9 @@ Examples:
 - "search python tutorials" → {{"intent": "web_search", "tool": "web_search", "params": {{"query": "python tutorials"}}}}
 
 IMPORTANT: If the user says search/find/locate/open for a file or folder, ALWAYS use open_file or open_folder.
+If the user asks for several things, return a plan with one step per tool call:
+- "what's my RAM and what time is it" → {{"intent": "plan", "tool": "plan", "steps": [{{"id": 1, "tool": "system_info", "params": {{"query": "ram"}}}}, {{"id": 2, "tool": "get_time", "params": {{}}}}]}}
+A step that needs another step to finish first lists it in "after": [1]; "{{1}}" in a param is replaced by step 1's result.
 Never respond with text. Only return JSON.
 
 Command: "{text}"
@@ -64,36 +74,210 @@ Examples:
 
 Return ONLY raw JSON. Nothing else."""
 
-def call_groq(text):
+RULE_STATS = intent_rules.RuleStats()
+LLM_CALLS  = {"count": 0, "total_ms": 0.0}
+
+# LLM answers keyed on the normalized command. INTENT_CACHE_FILE="" keeps
+# it in memory only; INTENT_CACHE_SIMILARITY=1 turns fuzzy matching off.
+INTENT_CACHE = IntentCache(
+    max_size=int(os.getenv("INTENT_CACHE_SIZE", "512")),
+    ttl=int(os.getenv("INTENT_CACHE_TTL", str(24 * 3600))),
+    path=os.getenv("INTENT_CACHE_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_cache.json")) or None,
+    similarity=float(os.getenv("INTENT_CACHE_SIMILARITY", "0.88")),
+)
+atexit.register(INTENT_CACHE.flush)
+
+# Sends only the top-k relevant tool schemas; PROMPT_RETRIEVAL=0 always
+# sends the full SYSTEM_PROMPT.
+PROMPT_RETRIEVAL = os.getenv("PROMPT_RETRIEVAL", "1") == "1"
+RETRIEVER = ToolRetriever(top_k=int(os.getenv("PROMPT_TOP_K", "4")))
+
+# Streams the completion and stops reading as soon as the intent JSON is
+# complete; NLP_STREAM=0 waits for the whole response instead.
+NLP_STREAM   = os.getenv("NLP_STREAM", "1") == "1"
+STREAM_STATS = {"calls": 0, "early": 0, "first_token_ms": 0.0, "intent_ms": 0.0}
+
+def _strip_fences(raw):
+    raw = raw.strip()
+    if raw.startswith("```"):
+        raw = raw.split("```")[1]
+        if raw.startswith("json"):
+            raw = raw[4:]
+    return json.loads(raw.strip())
+
+def _read_stream(stream, started):
+    """Feeds streamed tokens to the parser and closes the stream once the
+    intent is complete, so the rest of the completion is never generated."""
+    parser, raw, first = IntentStreamParser(), "", None
+    try:
+        for delta in stream:
+            if first is None:
+                first = (time.time() - started) * 1000
+            raw += delta
+            if parser.feed(delta) is not None:
+                STREAM_STATS["early"] += 1
+                break
+    finally:
+        stream.close()
+    STREAM_STATS["calls"]          += 1
+    STREAM_STATS["first_token_ms"] += first or 0.0
+    STREAM_STATS["intent_ms"]      += (time.time() - started) * 1000
+    result = parser.finish()
+    return result if result is not None else _strip_fences(raw)
+
+def call_llm(text):
+    started = time.time()
+    if PROMPT_RETRIEVAL:
+        prompt, mode, tools = RETRIEVER.build(text, SYSTEM_PROMPT)
+    else:
+        prompt, mode, tools = SYSTEM_PROMPT, "full", []
+    print(f"[NLP] Prompt: {mode}, {len(prompt)} chars vs {len(SYSTEM_PROMPT)} full {tools or ''}")
+    try:
+        messages = [
+            {"role": "system", "content": prompt},
+            {"role": "user",   "content": f'User said: "{text}"'}
+        ]
+        if NLP_STREAM:
+            return _read_stream(LLM.stream(messages, temperature=0.1, max_tokens=300), started)
+        return _strip_fences(LLM.complete(messages, temperature=0.1, max_tokens=300))
+    
+    except Exception as e:
+      print(f"[NLP ERROR] {type(e).__name__}: {e}")
+    finally:
+        elapsed = (time.time() - started) * 1000
+        LLM_CALLS["count"]    += 1
+        LLM_CALLS["total_ms"] += elapsed
+        RETRIEVER.record(mode, prompt, elapsed)
+
+def _local(text):
+    """Intent from the local rules or the cache, or None if the LLM is needed."""
+    # Common commands are matched locally; only the rest go to the LLM
+    result = intent_rules.match(text)
+    RULE_STATS.record(result)
+    if result is not None:
+        print(f"[NLP] '{text}' → {result} (local rule)")
+        return result
+    cached, how = INTENT_CACHE.get(text)
+    if cached is not None:
+        print(f"[NLP] '{text}' → {cached} (cache, {how})")
+        return cached
+    return None
+
+def _remember(text, result):
+    # Chit-chat answers shouldn't repeat word for word, and failures shouldn't stick
+    if isinstance(result, dict) and result.get("tool") and result.get("tool") != "general":
+        INTENT_CACHE.put(text, result)
+
+def handle_parse(data):
+    text = data.get('text', '')
+    if not text:
+        return {"error": "No text provided"}
+    result = _local(text)
+    if result is not None:
+        return result
+    result = call_llm(text)
+    print(f"[NLP] '{text}' → {result}")
+    _remember(text, result)
+    return result
+
+# Batch size limits: commands per LLM request and characters of commands
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "25"))
+BATCH_MAX_CHARS = int(os.getenv("BATCH_MAX_CHARS", "4000"))
+BATCH_STATS     = {"batches": 0, "items": 0, "llm_requests": 0, "fallbacks": 0}
+
+def call_llm_batch(batch):
+    """One LLM request for a chunk of [(index, text)] → {index: intent}."""
+    started = time.time()
     try:
-        response = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user",   "content": f'User said: "{text}"'}
+        raw = LLM.complete(
+            [
+                {"role": "system", "content": intent_batch.BATCH_PROMPT},
+                {"role": "user",   "content": intent_batch.user_message(batch)}
             ],
             temperature=0.1,
-            max_tokens=300,
+            max_tokens=intent_batch.TOKENS_PER_ITEM * len(batch) + 50,
         )
-        raw = response.choices[0].message.content.strip()
-        if raw.startswith("```"):
-            raw = raw.split("```")[1]
-            if raw.startswith("json"):
-                raw = raw[4:]
-        return json.loads(raw.strip())
-    
+        return intent_batch.align(raw, batch)
     except Exception as e:
-      print(f"[NLP ERROR] {type(e).__name__}: {e}")
+        print(f"[NLP ERROR] batch of {len(batch)}: {type(e).__name__}: {e}")
+        return {}
+    finally:
+        BATCH_STATS["llm_requests"] += 1
+        print(f"[NLP] Batch of {len(batch)} in {(time.time() - started) * 1000:.0f}ms")
+
+def handle_parse_batch(data):
+    texts = data.get('texts') or []
+    if not isinstance(texts, list) or not all(isinstance(t, str) and t for t in texts):
+        return {"error": "texts must be a list of non-empty strings"}
+    results = [None] * len(texts)
+    # Same command twice in a session → ask once
+    pending = {}
+    for i, text in enumerate(texts):
+        results[i] = _local(text)
+        if results[i] is None:
+            pending.setdefault(intent_rules.normalize(text), []).append(i)
+    first = [(idxs[0], texts[idxs[0]]) for idxs in pending.values()]
+    answers = {}
+    for batch in intent_batch.chunks(first, BATCH_MAX_ITEMS, BATCH_MAX_CHARS):
+        answers.update(call_llm_batch(batch))
+    for idx, text in first:
+        result = answers.get(idx)
+        if result is None:
+            # Malformed or missing in the batch reply → ask for this one alone
+            BATCH_STATS["fallbacks"] += 1
+            result = call_llm(text)
+        _remember(text, result)
+        for i in pending[intent_rules.normalize(text)]:
+            results[i] = result
+    BATCH_STATS["batches"] += 1
+    BATCH_STATS["items"]   += len(texts)
+    return {"results": results}
+
+def handle_stats(data):
+    stats = {"rules": RULE_STATS.snapshot()}
+    avg_ms = LLM_CALLS["total_ms"] / LLM_CALLS["count"] if LLM_CALLS["count"] else None
+    stats["llm"] = {
+        "calls":  LLM_CALLS["count"],
+        "avg_ms": round(avg_ms, 1) if avg_ms else None,
+        # each rule hit is one LLM round trip we didn't make
+        "saved_ms_estimate": round(avg_ms * stats["rules"]["hits"]) if avg_ms else None,
+    }
+    stats["cache"] = INTENT_CACHE.stats(avg_ms)
+    stats["prompt"] = RETRIEVER.stats()
+    n = STREAM_STATS["calls"]
+    stats["stream"] = {
+        "enabled":            NLP_STREAM,
+        "calls":              n,
+        "early_stops":        STREAM_STATS["early"],
+        "avg_first_token_ms": round(STREAM_STATS["first_token_ms"] / n, 1) if n else None,
+        "avg_intent_ms":      round(STREAM_STATS["intent_ms"] / n, 1) if n else None,
+    }
+    stats["batch"] = dict(BATCH_STATS)
+    stats["provider"] = LLM.stats()
+    return stats
+
+# Used by the gateway when all services run in one process
+HANDLERS = {
+    '/parse': handle_parse,
+    '/parse_batch': handle_parse_batch,
+    '/stats': handle_stats,
+}
 
 @app.route('/parse', methods=['POST'])
 def parse():
     data = request.get_json()
-    text = data.get('text', '')
-    if not text:
+    if not data.get('text', ''):
         return jsonify({"error": "No text provided"}), 400
-    result = call_groq(text)
-    print(f"[NLP] '{text}' → {result}")
-    return jsonify(result)
+    return jsonify(handle_parse(data))
+
+@app.route('/parse_batch', methods=['POST'])
+def parse_batch():
+    result = handle_parse_batch(request.get_json() or {})
+    return jsonify(result), 400 if "error" in result else 200
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    return jsonify(handle_stats({}))
 
 if __name__ == '__main__':
     app.run(port=5002, debug=False)
@@ -0,0 +1,166 @@
+# nlp/tool_retrieval.py
+# Picks the few tools an utterance could plausibly mean and builds a
+# compact system prompt with only their schemas and examples, instead of
+# sending the whole catalogue on every call.
+
+import math, re, threading
+from collections import Counter
+
+# tool → (schema line, keywords, [(example utterance, example JSON)])
+CATALOG = {
+    'web_search': ('{"intent":"search","tool":"web_search","params":{"query":"..."}}',
+                   'search google look up web internet find information who what how why news weather',
+                   [('search python tutorials', '{"intent":"web_search","tool":"web_search","params":{"query":"python tutorials"}}')]),
+    'calendar':   ('{"intent":"calendar","tool":"calendar","params":{"action":"add","title":"...","datetime":"..."}}',
+                   'calendar event meeting schedule remind reminder appointment tomorrow today tonight monday tuesday wednesday thursday friday saturday sunday am pm',
+                   [('add meeting with Sam tomorrow at 3pm', '{"intent":"calendar","tool":"calendar","params":{"action":"add","title":"meeting with Sam","datetime":"tomorrow 3pm"}}')]),
+    'email':      ('{"intent":"email","tool":"email","params":{"to":"...","subject":"...","body":"..."}}',
+                   'email mail send gmail message write compose subject',
+                   [('email bob@example.com saying hi', '{"intent":"email","tool":"email","params":{"to":"bob@example.com","subject":"Hi","body":"hi"}}')]),
+    'open_app':   ('{"intent":"open_app","tool":"open_app","params":{"target":"chrome|notepad|calculator|spotify|vs code|explorer|cmd|word|excel|powerpoint"}}',
+                   'open launch start run app application chrome notepad calculator spotify code explorer cmd word excel powerpoint paint terminal',
+                   [('Open Chrome', '{"intent":"open_app","tool":"open_app","params":{"target":"chrome"}}')]),
+    'open_folder': ('{"intent":"open_folder","tool":"open_folder","params":{"name":"..."}}',
+                    'open folder directory explorer show search locate',
+                    [('open aura folder', '{"intent":"open_folder","tool":"open_folder","params":{"name":"aura"}}'),
+                     ('search aura folder in file explorer', '{"intent":"open_folder","tool":"open_folder","params":{"name":"aura"}}')]),
+    'close_app':  ('{"intent":"close_app","tool":"close_app","params":{"target":"chrome|notepad|..."}}',
+                   'close quit exit kill stop shut app application',
+                   [('close notepad', '{"intent":"close_app","tool":"close_app","params":{"target":"notepad"}}')]),
+    'read_file':  ('{"intent":"read_file","tool":"read_file","params":{"path":"demo.txt"}}',
+                   'read file contents show open txt log what says inside',
+                   [('Read notes.txt', '{"intent":"read_file","tool":"read_file","params":{"path":"notes.txt"}}')]),
+    'create_file': ('{"intent":"create_file","tool":"create_file","params":{"path":"demo.txt","content":"..."}}',
+                    'create make new file write save txt',
+                    [('Create test.txt', '{"intent":"create_file","tool":"create_file","params":{"path":"test.txt","content":""}}')]),
+    'edit_file':  ('{"intent":"edit_file","tool":"edit_file","params":{"path":"demo.txt","content":"new content","mode":"overwrite|append"}}',
+                   'edit append add write change update overwrite file txt',
+                   [('Edit demo.txt add hello', '{"intent":"edit_file","tool":"edit_file","params":{"path":"demo.txt","content":"hello","mode":"append"}}')]),
+    'delete_file': ('{"intent":"delete_file","tool":"delete_file","params":{"path":"demo.txt"}}',
+                    'delete remove erase trash file folder',
+                    [('Delete demo.txt', '{"intent":"delete_file","tool":"delete_file","params":{"path":"demo.txt"}}')]),
+    'list_files': ('{"intent":"list_files","tool":"list_files","params":{"path":"desktop|downloads|documents|pictures"}}',
+                   'list show files folder desktop downloads documents pictures music videos what in',
+                   [('Show downloads', '{"intent":"list_files","tool":"list_files","params":{"path":"downloads"}}')]),
+    'find_file':  ('{"intent":"find_file","tool":"find_file","params":{"name":"demo.txt"}}',
+                   'find locate where search file pdf docx txt',
+                   [('Find report.pdf', '{"intent":"find_file","tool":"find_file","params":{"name":"report.pdf"}}')]),
+    'mouse':      ('{"intent":"mouse","tool":"mouse","params":{"action":"click|move|scroll_up|scroll_down|right_click|double_click","x":100,"y":200}}',
+                   'mouse click move scroll cursor right double pointer',
+                   [('scroll down', '{"intent":"mouse","tool":"mouse","params":{"action":"scroll_down"}}')]),
+    'keyboard':   ('{"intent":"keyboard","tool":"keyboard","params":{"action":"type|hotkey|press|screenshot","text":"...","keys":"ctrl+c","key":"enter"}}',
+                   'type press key keyboard hotkey ctrl alt shift enter screenshot copy paste',
+                   [('Press Ctrl S', '{"intent":"keyboard","tool":"keyboard","params":{"action":"hotkey","keys":"ctrl+s"}}'),
+                    ('Take a screenshot', '{"intent":"keyboard","tool":"keyboard","params":{"action":"screenshot"}}')]),
+    'volume':     ('{"intent":"volume","tool":"volume","params":{"action":"up|down|mute","amount":5}}',
+                   'volume sound louder quieter mute unmute up down audio speaker',
+                   [('Turn up volume', '{"intent":"volume","tool":"volume","params":{"action":"up","amount":5}}')]),
+    'system_info': ('{"intent":"system_info","tool":"system_info","params":{"query":"all|cpu|ram|disk|battery|system"}}',
+                    'ram memory cpu disk battery storage system usage specs processor space',
+                    [('What is my RAM?', '{"intent":"system_info","tool":"system_info","params":{"query":"ram"}}')]),
+    'window':     ('{"intent":"window","tool":"window","params":{"action":"list|focus|minimize|maximize","target":"..."}}',
+                   'window windows minimize maximize focus switch list',
+                   [('minimize chrome', '{"intent":"window","tool":"window","params":{"action":"minimize","target":"chrome"}}')]),
+    'get_time':   ('{"intent":"get_time","tool":"get_time","params":{}}',
+                   'time date day today clock',
+                   [('what time is it', '{"intent":"get_time","tool":"get_time","params":{}}')]),
+    'read_screen': ('{"intent":"read_screen","tool":"read_screen","params":{"question":"what do you see?"}}',
+                    'screen see look display showing read',
+                    [("What's on my screen?", '{"intent":"read_screen","tool":"read_screen","params":{"question":"what do you see?"}}')]),
+    'click_icon': ('{"intent":"click_icon","tool":"click_icon","params":{"target":"Chrome|Recycle Bin|...","action":"double_click"}}',
+                   'click icon button tap recycle bin',
+                   [('click the recycle bin', '{"intent":"click_icon","tool":"click_icon","params":{"target":"Recycle Bin","action":"double_click"}}')]),
+    'desktop_icons': ('{"intent":"desktop_icons","tool":"desktop_icons","params":{}}',
+                      'desktop icons shortcuts',
+                      [('Show desktop icons', '{"intent":"desktop_icons","tool":"desktop_icons","params":{}}')]),
+    'general':    ('{"intent":"general","tool":"general","params":{"response":"..."}}',
+                   '', []),
+}
+
+HEADER = """You are AURA's intent parser. Return ONLY a raw JSON object, no markdown, no explanation.
+IMPORTANT: If the user says search/find/locate/open for a file or folder, ALWAYS use a file or folder tool.
+If none of the tools fit, use general and put your spoken reply in params.response.
+If the user asks for several things, return a plan instead of a single tool:
+{"intent":"plan","tool":"plan","steps":[{"id":1,"tool":"...","params":{...}},{"id":2,"tool":"...","params":{...},"after":[1]}]}
+Only list a step in "after" if it needs that step to finish first; "{{1}}" in a param is replaced by step 1's result.
+
+Available tools:
+"""
+FOOTER = "\nReturn ONLY raw JSON. Nothing else."
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOP = set("a an the is are am be to of on in at by my me i you it its and or for with about "
+            "this that these those please can could would will do does what".split())
+
+
+def _stem(w):
+    return w[:-1] if len(w) > 3 and w.endswith('s') and not w.endswith('ss') else w
+
+
+def tokens(text):
+    return [_stem(w) for w in _WORD.findall(text.lower()) if w not in _STOP]
+
+
+def render(chosen, header=HEADER, footer=FOOTER):
+    """System prompt listing only the `chosen` tools and their examples."""
+    width  = max(len(t) for t in chosen) + 1
+    lines  = [header]
+    lines += [f"{t.ljust(width)}→ {CATALOG[t][0]}" for t in chosen]
+    examples = [(u, j) for t in chosen for u, j in CATALOG[t][2]]
+    if examples:
+        lines.append("\nExamples:")
+        lines += [f'"{u}" → {j}' for u, j in examples]
+    lines.append(footer)
+    return "\n".join(lines)
+
+
+class ToolRetriever:
+    """Scores tools by the IDF-weighted overlap between the utterance and
+    each tool's keywords + example utterances."""
+
+    def __init__(self, top_k=4, min_score=1.0):
+        self.top_k     = top_k
+        self.min_score = min_score
+        self.vocab     = {}
+        for tool, (_, keywords, examples) in CATALOG.items():
+            words = tokens(keywords) + [w for u, _ in examples for w in tokens(u)]
+            self.vocab[tool] = set(words)
+        df = Counter(w for v in self.vocab.values() for w in v)
+        n  = len(self.vocab)
+        self.idf = {w: math.log(1 + n / c) for w, c in df.items()}
+        self.lock  = threading.Lock()
+        self.modes = {"compact": {"calls": 0, "chars": 0, "ms": 0.0},
+                      "full":    {"calls": 0, "chars": 0, "ms": 0.0}}
+
+    def rank(self, text):
+        words = set(tokens(text))
+        scores = {tool: sum(self.idf[w] for w in words & vocab) for tool, vocab in self.vocab.items()}
+        return sorted(((s, t) for t, s in scores.items() if s > 0), reverse=True)
+
+    def build(self, text, full_prompt):
+        """(prompt, mode, tools). Falls back to `full_prompt` when no tool
+        scores at least `min_score` — better a long prompt than a wrong one."""
+        ranked = self.rank(text)
+        if not ranked or ranked[0][0] < self.min_score:
+            return full_prompt, "full", []
+        chosen = [t for _, t in ranked[:self.top_k] if t != 'general'] + ['general']
+        return render(chosen), "compact", chosen
+
+    def record(self, mode, prompt, ms):
+        with self.lock:
+            m = self.modes[mode]
+            m["calls"] += 1
+            m["chars"] += len(prompt)
+            m["ms"]    += ms
+
+    def stats(self):
+        with self.lock:
+            out = {}
+            for mode, m in self.modes.items():
+                out[mode] = {
+                    "calls":      m["calls"],
+                    # ~4 characters per token is close enough for English + JSON
+                    "avg_prompt_tokens": round(m["chars"] / m["calls"] / 4) if m["calls"] else None,
+                    "avg_ms":     round(m["ms"] / m["calls"], 1) if m["calls"] else None,
+                }
+            return out
@@ -1,4 +1,4 @@
-import subprocess
+import subprocess, sys, os
 
 services = [
     "gateway/app.py",
@@ -9,7 +9,17 @@ services = [
     "vision/vision_service.py",
 ]
 
-for service in services:
-    subprocess.Popen(["python", service])
+# --standin answers LLM calls from the local stand-in server (no network)
+if "--standin" in sys.argv:
+    os.environ["LLM_PROVIDER"] = "local"
+    subprocess.Popen(["python", "llm/llm_standin.py"])
 
-print("All AURA services started.")
+# --monolith runs everything inside the gateway process instead
+if "--monolith" in sys.argv:
+    subprocess.Popen(["python", "gateway/app.py", "--monolith"])
+    print("AURA started in monolith mode.")
+else:
+    for service in services:
+        subprocess.Popen(["python", service])
+
+    print("All AURA services started.")
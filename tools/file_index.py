@@ -0,0 +1,278 @@
+# tools/file_index.py
+# Background filename index — crawls the search roots once, keeps a SQLite
+# index on disk and answers name lookups without touching the filesystem.
+
+import os, sqlite3, threading, time
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:  # watchdog is optional — fall back to periodic rescans
+    Observer = None
+    FileSystemEventHandler = object
+
+SKIP_DIRS = {'$recycle.bin', 'system volume information', '$windows.~bt', '$windows.~ws'}
+BATCH_SIZE = 2000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path       TEXT PRIMARY KEY,
+    name       TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    is_dir     INTEGER NOT NULL,
+    mtime      REAL,
+    scan       INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_files_name_lower ON files(name_lower);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _norm(path):
+    return os.path.normcase(os.path.normpath(path))
+
+
+def top_level_roots(roots):
+    """Drop roots that are nested inside another root so each tree is crawled once."""
+    unique = []
+    for r in sorted({os.path.normpath(r) for r in roots if r and os.path.isdir(r)}, key=len):
+        nr = _norm(r)
+        if not any(nr == _norm(u) or nr.startswith(_norm(u).rstrip(os.sep) + os.sep) for u in unique):
+            unique.append(r)
+    return unique
+
+
+class _WatchHandler(FileSystemEventHandler):
+    def __init__(self, index):
+        self.index = index
+
+    def on_created(self, event):
+        self.index.add_path(event.src_path, event.is_directory)
+
+    def on_deleted(self, event):
+        self.index.remove_path(event.src_path)
+
+    def on_moved(self, event):
+        self.index.remove_path(event.src_path)
+        self.index.add_path(event.dest_path, event.is_directory)
+
+
+class FileIndex:
+    """On-disk filename index over a list of search roots.
+
+    `roots` is ordered by priority — lookups return matches under earlier
+    roots first, the same order the old glob search visited them in.
+    """
+
+    def __init__(self, db_path, roots, rescan_interval=6 * 3600):
+        self.db_path         = db_path
+        self.roots           = list(roots)
+        self.rescan_interval = rescan_interval
+        self.lock            = threading.Lock()
+        self.db              = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+        self.scanning        = False
+        self.scan_id         = int(self._get_meta('scan_id', 0))
+        self.version         = 0      # bumped on every write so in-memory views know to rebuild
+        self.observer        = None
+        self.started         = False
+
+    # ── metadata ────────────────────────────
+    def _get_meta(self, key, default=None):
+        with self.lock:
+            row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, key, value):
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+            self.db.commit()
+
+    @property
+    def ready(self):
+        """True once at least one full crawl has finished (possibly in a previous run)."""
+        return self._get_meta('last_scan') is not None
+
+    # ── crawling ────────────────────────────
+    def start(self):
+        if self.started:
+            return
+        self.started = True
+        threading.Thread(target=self._run, daemon=True, name="file-index").start()
+
+    def _run(self):
+        self._start_watching()
+        while True:
+            last = float(self._get_meta('last_scan', 0))
+            wait = last + self.rescan_interval - time.time()
+            if wait > 0:
+                time.sleep(min(wait, 60))
+                continue
+            try:
+                self.scan()
+            except Exception as e:
+                print(f"[INDEX ERROR] Scan failed: {e}")
+                time.sleep(60)
+
+    def scan(self):
+        """Walk every root and replace the index contents with what is on disk now."""
+        self.scanning = True
+        started = time.time()
+        scan_id = self.scan_id = self.scan_id + 1
+        batch, count = [], 0
+        try:
+            for root in top_level_roots(self.roots):
+                for entry in self._walk(root):
+                    batch.append(entry + (scan_id,))
+                    if len(batch) >= BATCH_SIZE:
+                        self._write_batch(batch)
+                        count += len(batch)
+                        batch = []
+            self._write_batch(batch)
+            count += len(batch)
+            with self.lock:
+                self.db.execute("DELETE FROM files WHERE scan < ?", (scan_id,))
+                self.db.commit()
+                self.version += 1
+        finally:
+            self.scanning = False
+        self._set_meta('scan_id', scan_id)
+        self._set_meta('last_scan', time.time())
+        self._set_meta('scan_seconds', round(time.time() - started, 2))
+        print(f"[INDEX] Indexed {count} entries in {time.time() - started:.1f}s")
+
+    def _walk(self, root):
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for e in it:
+                        # glob('**') never matched dot-names, keep that behaviour
+                        if e.name.startswith('.'):
+                            continue
+                        try:
+                            is_dir = e.is_dir(follow_symlinks=False)
+                            mtime  = e.stat(follow_symlinks=False).st_mtime
+                        except OSError:
+                            continue
+                        yield (e.path, e.name, e.name.lower(), int(is_dir), mtime)
+                        if is_dir and e.name.lower() not in SKIP_DIRS:
+                            stack.append(e.path)
+            except OSError:
+                continue
+
+    def _write_batch(self, batch):
+        if not batch:
+            return
+        with self.lock:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO files (path, name, name_lower, is_dir, mtime, scan) VALUES (?, ?, ?, ?, ?, ?)",
+                batch)
+            self.db.commit()
+            self.version += 1
+
+    # ── live updates ────────────────────────
+    def _start_watching(self):
+        if Observer is None:
+            print("[INDEX] watchdog not installed — relying on periodic rescans.")
+            return
+        try:
+            self.observer = Observer()
+            handler = _WatchHandler(self)
+            for root in top_level_roots(self.roots):
+                self.observer.schedule(handler, root, recursive=True)
+            self.observer.daemon = True
+            self.observer.start()
+        except Exception as e:
+            print(f"[INDEX] File watching unavailable: {e}")
+            self.observer = None
+
+    def add_path(self, path, is_dir=None):
+        name = os.path.basename(path)
+        if not name or name.startswith('.'):
+            return
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        if is_dir is None:
+            is_dir = os.path.isdir(path)
+        scan_id = self.scan_id
+        batch   = [(path, name, name.lower(), int(is_dir), st.st_mtime)]
+        if is_dir:  # a folder moved in brings its whole subtree with it
+            batch.extend(self._walk(path))
+        self._write_batch([entry + (scan_id,) for entry in batch])
+        self._set_meta('last_event', time.time())
+
+    def remove_path(self, path):
+        prefix = path.rstrip('\\/') + os.sep
+        with self.lock:
+            self.db.execute("DELETE FROM files WHERE path = ? OR substr(path, 1, ?) = ?",
+                            (path, len(prefix), prefix))
+            self.db.commit()
+            self.version += 1
+        self._set_meta('last_event', time.time())
+
+    # ── lookups ─────────────────────────────
+    def _rank(self, paths):
+        roots = [_norm(r).rstrip(os.sep) + os.sep for r in self.roots]
+
+        def priority(p):
+            np = _norm(p)
+            for i, r in enumerate(roots):
+                if np.startswith(r):
+                    return i
+            return len(roots)
+
+        return sorted(paths, key=lambda p: (priority(p), len(p)))
+
+    def _query(self, sql, args, limit):
+        with self.lock:
+            rows = self.db.execute(sql + " LIMIT ?", args + (limit,)).fetchall()
+        return self._rank([r[0] for r in rows])
+
+    def exact(self, name, limit=200):
+        return self._query("SELECT path FROM files WHERE name = ?", (name,), limit)
+
+    def lookup(self, name, limit=200):
+        """Case-insensitive exact-name lookup (how Windows compares filenames)."""
+        return self._query("SELECT path FROM files WHERE name_lower = ?", (name.lower(),), limit)
+
+    def prefix(self, prefix, limit=200):
+        p = prefix.lower()
+        return self._query("SELECT path FROM files WHERE name_lower >= ? AND name_lower < ?",
+                           (p, p + '\uffff'), limit)
+
+    def pattern(self, pattern, limit=200):
+        """Glob-style lookup (`*.pdf`, `report?.txt`) against lower-cased names."""
+        return self._query("SELECT path FROM files WHERE name_lower GLOB ?", (pattern.lower(),), limit)
+
+    def folders(self, roots=None):
+        """All indexed folders as (path, name, mtime), optionally limited to some roots."""
+        with self.lock:
+            rows = self.db.execute("SELECT path, name, mtime FROM files WHERE is_dir = 1").fetchall()
+        if not roots:
+            return rows
+        prefixes = tuple(_norm(r).rstrip(os.sep) + os.sep for r in roots if r)
+        return [r for r in rows if _norm(r[0]).startswith(prefixes)]
+
+    def status(self):
+        with self.lock:
+            files, dirs = self.db.execute(
+                "SELECT COUNT(*) - COALESCE(SUM(is_dir), 0), COALESCE(SUM(is_dir), 0) FROM files").fetchone()
+        last_scan  = self._get_meta('last_scan')
+        last_event = self._get_meta('last_event')
+        return {
+            "ready":        last_scan is not None,
+            "scanning":     self.scanning,
+            "watching":     self.observer is not None,
+            "files":        files,
+            "folders":      dirs,
+            "db_bytes":     os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0,
+            "last_scan":    float(last_scan) if last_scan else None,
+            "age_seconds":  round(time.time() - float(last_scan), 1) if last_scan else None,
+            "scan_seconds": float(self._get_meta('scan_seconds', 0)),
+            "last_event":   float(last_event) if last_event else None,
+            "roots":        top_level_roots(self.roots),
+        }
@@ -0,0 +1,168 @@
+# tools/folder_index.py
+# Fuzzy folder lookup for open_folder — an in-memory view over the folder
+# rows of the file index, ranked by token overlap, edit distance and recency.
+
+import math, os, re, threading, time
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+GOOD_MATCH     = 0.72   # below this we let Explorer search instead
+MAX_CANDIDATES = 300
+RECENCY_DAYS   = 30
+
+_SPLIT = re.compile(r'[^a-z0-9]+')
+_CAMEL = re.compile(r'(?<=[a-z])(?=[A-Z])')
+
+
+def tokenize(name):
+    """'MyProjects_2024' → ['my', 'projects', '2024']"""
+    return [t for t in _SPLIT.split(_CAMEL.sub(' ', name).lower()) if t]
+
+
+def trigrams(token):
+    t = f"  {token} "
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+
+def edit_distance(a, b, limit=3):
+    """Levenshtein distance, giving up early once it exceeds `limit`."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return prev[-1]
+
+
+def token_similarity(a, b):
+    if a == b:
+        return 1.0
+    if len(a) >= 3 and (b.startswith(a) or a.startswith(b)):
+        return 0.85
+    d = edit_distance(a, b, limit=max(1, len(a) // 3))
+    if d > max(1, len(a) // 3):
+        return 0.0
+    return 1.0 - d / max(len(a), len(b))
+
+
+class FolderMatcher:
+    """Ranked fuzzy folder-name lookup over a FileIndex.
+
+    The snapshot is rebuilt in the background whenever the index changes,
+    so a query never waits on SQLite or the filesystem.
+    """
+
+    def __init__(self, index, roots):
+        self.index       = index
+        self.roots       = list(roots)
+        self.version     = -1
+        self.entries     = []                  # (path, name, name_lower, tokens, mtime)
+        self.by_name     = defaultdict(list)   # lower-cased name → entry ids
+        self.by_token    = defaultdict(list)   # token → entry ids
+        self.by_trigram  = defaultdict(set)    # trigram → tokens
+        self.rebuilding  = False
+        self.lock        = threading.Lock()
+
+    # ── snapshot ────────────────────────────
+    def start(self, interval=5):
+        def loop():
+            while True:
+                self.refresh(wait=True)
+                time.sleep(interval)
+        threading.Thread(target=loop, daemon=True, name="folder-index-watch").start()
+
+    def refresh(self, wait=False):
+        if self.version == self.index.version or self.rebuilding:
+            return
+        if not self.index.ready:
+            return
+        self.rebuilding = True
+        if wait:
+            self._rebuild()
+        else:
+            threading.Thread(target=self._rebuild, daemon=True, name="folder-index").start()
+
+    def _rebuild(self):
+        try:
+            version = self.index.version
+            entries, by_name, by_token, by_trigram = [], defaultdict(list), defaultdict(list), defaultdict(set)
+            for path, name, mtime in self.index.folders(self.roots):
+                toks = tokenize(name)
+                i = len(entries)
+                entries.append((path, name, name.lower(), toks, mtime or 0))
+                by_name[name.lower()].append(i)
+                for t in set(toks):
+                    if t not in by_token:
+                        for g in trigrams(t):
+                            by_trigram[g].add(t)
+                    by_token[t].append(i)
+            with self.lock:
+                self.entries, self.by_name, self.by_token, self.by_trigram = entries, by_name, by_token, by_trigram
+                self.version = version
+            print(f"[FOLDERS] Indexed {len(entries)} folders")
+        except Exception as e:
+            print(f"[FOLDERS ERROR] Rebuild failed: {e}")
+        finally:
+            self.rebuilding = False
+
+    @property
+    def ready(self):
+        return self.version >= 0
+
+    # ── matching ────────────────────────────
+    def _similar_tokens(self, token, by_trigram):
+        """Vocabulary tokens that share enough trigrams with `token` to be worth scoring."""
+        grams = trigrams(token)
+        counts = defaultdict(int)
+        for g in grams:
+            for t in by_trigram.get(g, ()):
+                counts[t] += 1
+        need = max(1, len(grams) // 3)
+        close = sorted((t for t, c in counts.items() if c >= need), key=lambda t: -counts[t])[:50]
+        return [t for t in close if token_similarity(token, t) > 0]
+
+    def search(self, query, limit=5):
+        """Return [(score, path)] best first. Scores are 0–1 (recency can nudge slightly above)."""
+        q_lower  = query.strip().lower()
+        q_tokens = tokenize(query)
+        if not q_lower:
+            return []
+        with self.lock:
+            entries, by_name, by_token, by_trigram = self.entries, self.by_name, self.by_token, self.by_trigram
+
+        # Exact name hits need no scoring beyond recency/depth
+        candidates = set(by_name.get(q_lower, ()))
+        for qt in q_tokens:
+            for t in self._similar_tokens(qt, by_trigram):
+                candidates.update(by_token[t][:MAX_CANDIDATES])
+
+        now = time.time()
+        scored = []
+        for i in candidates:
+            path, name, name_lower, toks, mtime = entries[i]
+            if name_lower == q_lower:
+                base = 1.0
+            else:
+                overlap = sum(max((token_similarity(qt, t) for t in toks), default=0) for qt in q_tokens)
+                overlap = overlap / len(q_tokens) if q_tokens else 0
+                extra   = max(0, len(toks) - len(q_tokens)) * 0.05
+                ratio   = SequenceMatcher(None, q_lower, name_lower).ratio()
+                base    = 0.6 * overlap + 0.4 * ratio - extra
+            age_days = max(0, now - mtime) / 86400
+            recency  = 0.05 * math.exp(-age_days / RECENCY_DAYS)
+            depth    = 0.005 * path.count(os.sep)
+            scored.append((round(base + recency - depth, 4), path))
+        scored.sort(key=lambda s: -s[0])
+        return scored[:limit]
+
+    def best(self, query):
+        """Best folder for `query`, or None when nothing scores as a good match."""
+        results = self.search(query, limit=1)
+        if results and results[0][0] >= GOOD_MATCH:
+            return results[0][1]
+        return None
@@ -0,0 +1,118 @@
+# tools/process_index.py
+# Name → processes index for close_app. Instead of walking the whole
+# process table and substring-matching every name on each request, the
+# index keeps psutil.Process handles grouped by normalized executable name
+# and refreshes by diffing the pid list, so only new processes are
+# inspected. Killing works per process tree with a bounded wait.
+
+import os, threading, time
+import psutil
+
+
+def exe_name(path):
+    """'C:\\...\\WINWORD.EXE' → 'winword', 'code' → 'code'."""
+    name = os.path.basename(path.replace("\\", os.sep).replace("/", os.sep)).lower()
+    return name[:-4] if name.endswith(".exe") else name
+
+
+class ProcessIndex:
+
+    def __init__(self, max_age=2.0):
+        self.max_age    = max_age       # seconds before a lookup refreshes
+        self.procs      = {}            # pid → psutil.Process
+        self.names      = {}            # pid → exe name
+        self.by_name    = {}            # exe name → set of pids
+        self.lock       = threading.Lock()
+        self.updated_at = 0.0
+        self.refreshes  = 0
+        self.inspected  = 0
+
+    def start(self):
+        threading.Thread(target=self.refresh, daemon=True, name="process-index").start()
+
+    def refresh(self):
+        """Add new pids and drop dead ones; existing entries aren't re-read."""
+        with self.lock:
+            current = set(psutil.pids())
+            for pid in set(self.procs) - current:
+                self._drop(pid)
+            for pid in current - set(self.procs):
+                try:
+                    p = psutil.Process(pid)
+                    name = exe_name(p.name())
+                except psutil.Error:
+                    continue
+                self.procs[pid] = p
+                self.names[pid] = name
+                self.by_name.setdefault(name, set()).add(pid)
+                self.inspected += 1
+            self.updated_at = time.time()
+            self.refreshes += 1
+
+    def _drop(self, pid):
+        self.procs.pop(pid, None)
+        name = self.names.pop(pid, None)
+        pids = self.by_name.get(name)
+        if pids is not None:
+            pids.discard(pid)
+            if not pids:
+                del self.by_name[name]
+
+    def find(self, names):
+        """Live processes whose executable is one of `names`; if none are,
+        falls back to a substring match on the (few hundred) distinct names."""
+        if time.time() - self.updated_at > self.max_age:
+            self.refresh()
+        names = [exe_name(n) for n in names if n]
+        with self.lock:
+            pids = set().union(*(self.by_name.get(n, ()) for n in names))
+            if not pids:
+                pids = set().union(*(p for key, p in self.by_name.items() if any(n in key for n in names)))
+            found = [self.procs[pid] for pid in pids if pid != os.getpid()]
+        # is_running() also catches a pid reused by a different process
+        return [p for p in found if p.is_running()]
+
+    def kill_trees(self, procs, timeout=3.0):
+        """Terminate each matching process with its children, wait up to
+        `timeout` seconds, then kill whatever is left. → (closed, survivors)."""
+        chosen = {p.pid: p for p in procs}
+        victims = {}
+        for p in procs:
+            try:
+                # A match whose parent also matched is covered by the parent's tree
+                if p.ppid() in chosen:
+                    continue
+                for child in p.children(recursive=True):
+                    victims[child.pid] = child
+            except psutil.Error:
+                pass
+            victims[p.pid] = p
+        victims.pop(os.getpid(), None)
+        for p in victims.values():
+            try:
+                p.terminate()
+            except psutil.Error:
+                pass
+        gone, alive = psutil.wait_procs(list(victims.values()), timeout=timeout)
+        for p in alive:
+            try:
+                p.kill()
+            except psutil.Error:
+                pass
+        if alive:
+            gone_late, alive = psutil.wait_procs(alive, timeout=1)
+            gone += gone_late
+        with self.lock:
+            for p in gone:
+                self._drop(p.pid)
+        return len(gone), alive
+
+    def stats(self):
+        with self.lock:
+            return {
+                "processes":  len(self.procs),
+                "names":      len(self.by_name),
+                "refreshes":  self.refreshes,
+                "inspected":  self.inspected,
+                "age_s":      round(time.time() - self.updated_at, 1) if self.updated_at else None,
+            }
@@ -0,0 +1,159 @@
+# tools/search_cache.py
+# Keeps web searches cheap: results are cached by normalized query (LRU +
+# TTL, optionally saved to disk), identical searches in flight at the same
+# time share one request, and a token bucket spaces out the requests that
+# do go to the search engine — waiting only when the budget is used up.
+
+import json, os, re, threading, time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+def normalize(query):
+    q = re.sub(r"\s+", " ", query.strip().lower())
+    return re.sub(r"^[\s?!.,\"']+|[\s?!.,\"']+$", "", q)
+
+
+class RateLimited(Exception):
+    pass
+
+
+class TokenBucket:
+    """`rate` requests per second on average, bursts of up to `burst`."""
+
+    def __init__(self, rate=1.0, burst=3):
+        self.rate   = rate
+        self.burst  = burst
+        self.tokens = float(burst)
+        self.last   = time.monotonic()
+        self.lock   = threading.Lock()
+        self.waited = 0.0
+
+    def acquire(self, timeout=5.0):
+        """Take a token, sleeping only as long as needed. Raises RateLimited
+        if none frees up within `timeout` seconds."""
+        give_up = time.monotonic() + timeout
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+                self.last   = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            if now + wait > give_up:
+                raise RateLimited(f"over {self.rate:g} searches per second")
+            self.waited += wait
+            time.sleep(wait)
+
+
+class SearchCache:
+
+    def __init__(self, fetch, max_size=256, ttl=3600, path=None, rate=1.0, burst=3):
+        self.fetch    = fetch               # query → list of result dicts
+        self.max_size = max_size
+        self.ttl      = ttl
+        self.path     = path
+        self.bucket   = TokenBucket(rate, burst)
+        self.entries  = OrderedDict()       # key → (results, stored_at)
+        self.inflight = {}                  # key → Future
+        self.lock     = threading.Lock()
+        self.counts   = {"hits": 0, "misses": 0, "coalesced": 0, "stale_served": 0, "errors": 0}
+        self.dirty    = False
+        self.saved_at = 0.0
+        if path:
+            self._load()
+
+    def search(self, query):
+        """Results for `query`, from the cache when fresh."""
+        key = normalize(query)
+        with self.lock:
+            hit = self.entries.get(key)
+            if hit and time.time() - hit[1] <= self.ttl:
+                self.entries.move_to_end(key)
+                self.counts["hits"] += 1
+                return hit[0]
+            fut = self.inflight.get(key)
+            if fut is not None:
+                # Same search already running — wait for its answer
+                self.counts["coalesced"] += 1
+                leader = False
+            else:
+                fut = self.inflight[key] = Future()
+                self.counts["misses"] += 1
+                leader = True
+        if not leader:
+            return fut.result()
+        try:
+            results = self._fetch(key, query, hit)
+            fut.set_result(results)
+            return results
+        except Exception as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
+
+    def _fetch(self, key, query, stale):
+        try:
+            self.bucket.acquire()
+            results = self.fetch(query)
+        except Exception:
+            with self.lock:
+                self.counts["errors"] += 1
+                # Offline or throttled — an old answer beats none
+                if stale:
+                    self.counts["stale_served"] += 1
+                    return stale[0]
+            raise
+        if results:
+            with self.lock:
+                self.entries.pop(key, None)
+                self.entries[key] = (results, time.time())
+                while len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+                self.dirty = True
+            self._maybe_save()
+        return results
+
+    def stats(self):
+        with self.lock:
+            lookups = self.counts["hits"] + self.counts["misses"] + self.counts["coalesced"]
+            return {
+                **self.counts,
+                "size":       len(self.entries),
+                "hit_rate":   round((self.counts["hits"] + self.counts["coalesced"]) / lookups, 3) if lookups else 0.0,
+                "rate_limit_wait_s": round(self.bucket.waited, 1),
+                "persistent": bool(self.path),
+            }
+
+    # ── persistence ─────────────────────────
+    def flush(self):
+        self._maybe_save(min_interval=0)
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                rows = json.load(f)
+        except (OSError, ValueError):
+            return
+        # Expired entries are kept too: they are still served when offline
+        for key, results, stored_at in rows[-self.max_size:]:
+            self.entries[key] = (results, stored_at)
+        print(f"[TOOL] Loaded {len(self.entries)} cached searches")
+
+    def _maybe_save(self, min_interval=5):
+        if not self.path or not self.dirty or time.time() - self.saved_at < min_interval:
+            return
+        with self.lock:
+            rows = [[k, results, t] for k, (results, t) in self.entries.items()]
+            self.dirty, self.saved_at = False, time.time()
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(rows, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[TOOL] Could not save search cache: {e}")
@@ -0,0 +1,110 @@
+# tools/system_metrics.py
+# Samples CPU, memory, disk and battery every few seconds on a background
+# thread into a fixed-size ring buffer, so system_info can answer at once
+# (no blocking cpu_percent(interval=1)) and dashboards can chart history.
+
+import os, threading, time
+from collections import deque
+
+import psutil
+
+GB = 1024 ** 3
+DISK_PATH = os.getenv("SystemDrive", "C:") + "\\" if os.name == "nt" else "/"
+
+FIELDS = ("cpu", "ram_percent", "ram_used_gb", "ram_available_gb", "disk_percent", "disk_free_gb", "battery")
+
+
+class MetricsSampler:
+
+    def __init__(self, interval=2.0, size=900, disk_path=DISK_PATH, battery_every=15):
+        self.interval      = interval
+        self.samples       = deque(maxlen=size)     # size * interval seconds of history
+        self.disk_path     = disk_path
+        self.battery_every = battery_every          # battery reads are slow on some laptops
+        self.lock          = threading.Lock()
+        self.ticks         = 0
+        self.battery       = (None, None)
+        self.static        = {}
+
+    def start(self):
+        # First cpu_percent(None) call only sets the baseline
+        psutil.cpu_percent(interval=None)
+        mem  = psutil.virtual_memory()
+        disk = self._disk()
+        self.static = {
+            "cpu_cores":   psutil.cpu_count(),
+            "ram_total_gb": mem.total // GB,
+            "disk_total_gb": disk.total // GB if disk else None,
+        }
+        threading.Thread(target=self._run, daemon=True, name="metrics-sampler").start()
+
+    def _disk(self):
+        try:
+            return psutil.disk_usage(self.disk_path)
+        except OSError:
+            return None
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"[TOOL] Metrics sample failed: {e}")
+
+    def sample(self, cpu=None):
+        if self.ticks % self.battery_every == 0:
+            try:
+                b = psutil.sensors_battery()
+            except (AttributeError, OSError):
+                b = None
+            self.battery = (round(b.percent), b.power_plugged) if b else (None, None)
+        self.ticks += 1
+        mem  = psutil.virtual_memory()
+        disk = self._disk()
+        row = {
+            "t":                round(time.time(), 1),
+            "cpu":              psutil.cpu_percent(interval=None) if cpu is None else cpu,
+            "ram_percent":      mem.percent,
+            "ram_used_gb":      round(mem.used / GB, 2),
+            "ram_available_gb": round(mem.available / GB, 2),
+            "disk_percent":     disk.percent if disk else None,
+            "disk_free_gb":     round(disk.free / GB, 1) if disk else None,
+            "battery":          self.battery[0],
+            "plugged":          self.battery[1],
+        }
+        with self.lock:
+            self.samples.append(row)
+        return row
+
+    def latest(self):
+        with self.lock:
+            if self.samples:
+                return self.samples[-1]
+        # Asked before the first tick — a short blocking read is the best we have
+        return self.sample(cpu=psutil.cpu_percent(interval=0.1))
+
+    def window(self, seconds=60):
+        """{field: (avg, peak)} over the last `seconds`."""
+        since = time.time() - seconds
+        with self.lock:
+            rows = [r for r in self.samples if r["t"] >= since]
+        out = {}
+        for field in FIELDS:
+            values = [r[field] for r in rows if r[field] is not None]
+            if values:
+                out[field] = (round(sum(values) / len(values), 1), max(values))
+        return out
+
+    def series(self, seconds=None, fields=FIELDS):
+        """Column-oriented history for charts: {"t": [...], field: [...]}."""
+        with self.lock:
+            rows = list(self.samples)
+        if seconds:
+            since = time.time() - seconds
+            rows = [r for r in rows if r["t"] >= since]
+        out = {"interval_s": self.interval, **self.static, "t": [r["t"] for r in rows]}
+        for field in fields:
+            if field in FIELDS:
+                out[field] = [r[field] for r in rows]
+        return out
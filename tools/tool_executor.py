@@ -0,0 +1,122 @@
+# tools/tool_executor.py
+# Runs tools off the request thread with a deadline each. Blocking tools
+# share a bounded thread pool; tools that drive the desktop (mouse,
+# keyboard, windows) go through a single serial lane so two commands never
+# fight over the cursor or focus.
+#
+# When a deadline passes the caller gets ToolTimeout straight away and the
+# tool's cancel flag is set. Python threads can't be killed, so long tools
+# check cancelled() between units of work and stop early.
+
+import threading, time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+_local = threading.local()
+
+
+class ToolTimeout(Exception):
+    def __init__(self, tool, deadline):
+        super().__init__(f"{tool} is taking too long, so I stopped waiting after {deadline:g} seconds.")
+        self.tool     = tool
+        self.deadline = deadline
+
+
+def cancelled():
+    """True once the tool running on this thread has been given up on."""
+    flag = getattr(_local, "cancel", None)
+    return flag is not None and flag.is_set()
+
+
+class _ToolStats:
+    def __init__(self):
+        self.calls    = 0
+        self.errors   = 0
+        self.timeouts = 0
+        self.queued   = 0
+        self.running  = 0
+        self.queue_ms = deque(maxlen=200)
+        self.run_ms   = deque(maxlen=200)
+
+
+def _summary(values):
+    if not values:
+        return {"avg": None, "p95": None, "max": None}
+    s = sorted(values)
+    return {"avg": round(sum(s) / len(s), 1), "p95": round(s[int(len(s) * 0.95)], 1), "max": round(s[-1], 1)}
+
+
+class ToolExecutor:
+
+    def __init__(self, workers=8, serial=(), deadlines=None, default_deadline=15):
+        self.pool      = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tool")
+        self.lane      = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tool-serial")
+        self.serial    = set(serial)
+        self.deadlines = dict(deadlines or {})
+        self.default   = default_deadline
+        self.workers   = workers
+        self.lock      = threading.Lock()
+        self.stats_by  = {}
+
+    def _stats(self, tool):
+        with self.lock:
+            return self.stats_by.setdefault(tool, _ToolStats())
+
+    def _bump(self, st, **changes):
+        with self.lock:
+            for key, delta in changes.items():
+                setattr(st, key, getattr(st, key) + delta)
+
+    def run(self, tool, fn, params):
+        """fn(params) on the tool's lane; raises ToolTimeout past its deadline."""
+        deadline = self.deadlines.get(tool, self.default)
+        st       = self._stats(tool)
+        cancel   = threading.Event()
+        submitted = time.time()
+        self._bump(st, calls=1, queued=1)
+
+        def job():
+            started = time.time()
+            with self.lock:
+                st.queued  -= 1
+                st.running += 1
+                st.queue_ms.append((started - submitted) * 1000)
+            _local.cancel = cancel
+            try:
+                return fn(params)
+            except Exception:
+                self._bump(st, errors=1)
+                raise
+            finally:
+                _local.cancel = None
+                with self.lock:
+                    st.running -= 1
+                    st.run_ms.append((time.time() - started) * 1000)
+
+        future = (self.lane if tool in self.serial else self.pool).submit(job)
+        try:
+            return future.result(timeout=deadline)
+        except FutureTimeout:
+            cancel.set()
+            if future.cancel():          # never started — it won't run at all
+                self._bump(st, queued=-1)
+            self._bump(st, timeouts=1)
+            raise ToolTimeout(tool, deadline) from None
+
+    def stats(self):
+        with self.lock:
+            tools = {
+                tool: {
+                    "calls":     st.calls,
+                    "errors":    st.errors,
+                    "timeouts":  st.timeouts,
+                    "queued":    st.queued,
+                    "running":   st.running,
+                    "lane":      "serial" if tool in self.serial else "pool",
+                    "deadline_s": self.deadlines.get(tool, self.default),
+                    "queue_ms":  _summary(st.queue_ms),
+                    "run_ms":    _summary(st.run_ms),
+                }
+                for tool, st in self.stats_by.items()
+            }
+        return {"workers": self.workers, "serial_tools": sorted(self.serial), "tools": tools}
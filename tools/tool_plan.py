@@ -0,0 +1,121 @@
+# tools/tool_plan.py
+# Runs a multi-step intent: a list of tool calls where a step may wait for
+# others ("after") and use their results ("{{id}}" inside a string param).
+# Steps whose dependencies are done all run at once, so a plan takes about
+# as long as its slowest chain instead of the sum of its steps.
+#
+#   {"intent": "plan", "tool": "plan", "steps": [
+#       {"id": 1, "tool": "system_info", "params": {"query": "ram"}},
+#       {"id": 2, "tool": "get_time",    "params": {}},
+#       {"id": 3, "tool": "web_search",  "params": {"query": "python tutorials"}, "after": [1, 2]}]}
+
+import re, time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+MAX_STEPS = 10
+_REF = re.compile(r"\{\{\s*([\w-]+)\s*\}\}")
+
+
+class PlanError(ValueError):
+    pass
+
+
+def normalize(steps):
+    """Validated copy of `steps` with string ids and "after" lists.
+    Raises PlanError for unknown dependencies, duplicates or cycles."""
+    if not isinstance(steps, list) or not steps:
+        raise PlanError("steps must be a non-empty list")
+    if len(steps) > MAX_STEPS:
+        raise PlanError(f"at most {MAX_STEPS} steps per plan")
+    out = []
+    for n, step in enumerate(steps, 1):
+        if not isinstance(step, dict) or not step.get("tool"):
+            raise PlanError(f"step {n} has no tool")
+        after = step.get("after") or step.get("depends_on") or []
+        out.append({
+            "id":     str(step.get("id", n)),
+            "tool":   step["tool"],
+            "params": step.get("params") or {},
+            "after":  [str(a) for a in (after if isinstance(after, list) else [after])],
+        })
+    ids = [s["id"] for s in out]
+    if len(set(ids)) != len(ids):
+        raise PlanError("step ids must be unique")
+    for s in out:
+        missing = set(s["after"]) - set(ids)
+        if missing:
+            raise PlanError(f"step {s['id']} waits for unknown step {sorted(missing)[0]}")
+    # Kahn's algorithm — anything left over is on a cycle
+    waiting = {s["id"]: set(s["after"]) for s in out}
+    while True:
+        ready = [i for i, deps in waiting.items() if not deps]
+        if not ready:
+            break
+        for i in ready:
+            del waiting[i]
+        for deps in waiting.values():
+            deps.difference_update(ready)
+    if waiting:
+        raise PlanError(f"steps {sorted(waiting)} depend on each other in a cycle")
+    return out
+
+
+def _fill(value, results):
+    """Replace {{id}} references with the earlier steps' results."""
+    if isinstance(value, str):
+        return _REF.sub(lambda m: str(results.get(m.group(1), m.group(0))), value)
+    if isinstance(value, dict):
+        return {k: _fill(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fill(v, results) for v in value]
+    return value
+
+
+def run(steps, run_step, pool):
+    """Run a normalized plan. `run_step(tool, params)` returns the tool's
+    result string. Returns the per-step reports in plan order."""
+    by_id    = {s["id"]: s for s in steps}
+    results  = {}        # id → result text, for {{id}} references
+    reports  = {}
+    pending  = {s["id"] for s in steps}
+    running  = {}        # future → step id
+
+    def timed(step, params):
+        started = time.time()
+        try:
+            return "ok", run_step(step["tool"], params), started
+        except Exception as e:
+            if hasattr(e, "deadline"):           # tool_executor.ToolTimeout
+                return "timeout", str(e), started
+            return "error", f"{step['tool']} failed: {e}", started
+
+    while pending or running:
+        for sid in sorted(pending, key=list(by_id).index):
+            step = by_id[sid]
+            if any(d in pending or d in running.values() for d in step["after"]):
+                continue
+            pending.discard(sid)
+            failed = [d for d in step["after"] if reports[d]["status"] != "ok"]
+            if failed:
+                reports[sid] = {"id": sid, "tool": step["tool"], "status": "skipped",
+                                "result": f"Skipped because step {failed[0]} did not finish.", "ms": 0}
+                continue
+            running[pool.submit(timed, step, _fill(step["params"], results))] = sid
+        if not running:
+            continue
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for fut in done:
+            sid = running.pop(fut)
+            status, result, started = fut.result()
+            results[sid] = result
+            reports[sid] = {"id": sid, "tool": by_id[sid]["tool"], "status": status,
+                            "result": result, "ms": round((time.time() - started) * 1000, 1)}
+    return [reports[s["id"]] for s in steps]
+
+
+def merge(reports):
+    """One spoken answer for the whole plan."""
+    return " ".join(str(r["result"]).strip() for r in reports if str(r["result"]).strip())
+
+
+POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="plan")
@@ -1,9 +1,16 @@
 from flask import Flask, request, jsonify
 from ddgs import DDGS
-import csv, os, time, subprocess, psutil, platform, shutil, glob
+import csv, os, time, subprocess, psutil, platform, shutil, glob, fnmatch, atexit
 from datetime import datetime
 import pyautogui
 import pygetwindow as gw
+from file_index import FileIndex
+from folder_index import FolderMatcher
+import tool_plan
+from tool_executor import ToolExecutor, ToolTimeout, cancelled
+from search_cache import SearchCache, RateLimited
+from system_metrics import MetricsSampler
+from process_index import ProcessIndex, exe_name
 
 app = Flask(__name__)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -25,6 +32,11 @@ SEARCH_LOCATIONS = [
     'C:\\',
 ]
 
+# Crawled once in the background, then kept current by filesystem events.
+# Until the first crawl finishes we fall back to the old glob search.
+FILE_INDEX = FileIndex(os.path.join(BASE_DIR, "file_index.db"), SEARCH_LOCATIONS)
+FILE_INDEX.start()
+
 def find_file_everywhere(filename):
     """Search for a file by name across all common locations. Returns list of full paths."""
     found = []
@@ -33,14 +45,25 @@ def find_file_everywhere(filename):
 
     name = os.path.basename(filename) if os.path.sep in filename else filename
 
+    if FILE_INDEX.ready:
+        if glob.has_magic(name):
+            return FILE_INDEX.pattern(name)
+        return FILE_INDEX.lookup(name)
+
+    # Walked by hand rather than with glob so a search that has run past
+    # its deadline can stop between folders
     for location in SEARCH_LOCATIONS:
         if not os.path.exists(location):
             continue
         try:
-            matches = glob.glob(os.path.join(location, '**', name), recursive=True)
-            for m in matches:
-                if m not in found:
-                    found.append(m)
+            for root, dirs, files in os.walk(location):
+                if cancelled():
+                    return found
+                dirs[:] = [d for d in dirs if not d.startswith('.')]
+                for m in fnmatch.filter(dirs + files, name):
+                    path = os.path.join(root, m)
+                    if path not in found:
+                        found.append(path)
             if found:
                 break
         except Exception:
@@ -63,18 +86,34 @@ def resolve_path(path):
 # ════════════════════════════════════════════
 # 1. WEB SEARCH
 # ════════════════════════════════════════════
+def _ddgs_search(query):
+    with DDGS() as ddgs:
+        return list(ddgs.text(query, max_results=3, backend="lite"))
+
+# SEARCH_RATE searches per second with bursts of SEARCH_BURST; set
+# SEARCH_CACHE_FILE to keep results across restarts (and offline).
+SEARCH = SearchCache(
+    _ddgs_search,
+    max_size=int(os.getenv("SEARCH_CACHE_SIZE", "256")),
+    ttl=int(os.getenv("SEARCH_CACHE_TTL", "3600")),
+    path=os.getenv("SEARCH_CACHE_FILE") or None,
+    rate=float(os.getenv("SEARCH_RATE", "1")),
+    burst=int(os.getenv("SEARCH_BURST", "3")),
+)
+atexit.register(SEARCH.flush)
+
 def tool_web_search(params):
     query = params.get('query', '')
     try:
-        time.sleep(1)
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=3, backend="lite"))
+        results = SEARCH.search(query)
         if not results:
             return f"No results found for '{query}'."
         lines = [f"Here's what I found about '{query}':"]
         for i, r in enumerate(results, 1):
             lines.append(f"{i}. {r['title']}: {r['body'][:200]}")
         return "\n".join(lines)
+    except RateLimited:
+        return "I'm searching too often right now. Try again in a moment."
     except Exception as e:
         return f"Search failed: {e}"
 
@@ -161,6 +200,18 @@ FOLDER_SHORTCUTS = {
     'c:':        'C:\\',
 }
 
+FOLDER_SEARCH_ROOTS = [
+    os.path.expanduser('~\\Desktop'),
+    os.path.expanduser('~\\Documents'),
+    os.path.expanduser('~\\Downloads'),
+    os.path.expanduser('~'),
+    'C:\\Users\\Nitin',
+]
+
+# Folder names from the file index, kept in memory for fuzzy ranking
+FOLDER_INDEX = FolderMatcher(FILE_INDEX, FOLDER_SEARCH_ROOTS)
+FOLDER_INDEX.start()
+
 def tool_open_folder(params):
     name = params.get('name', '').strip()
     if not name:
@@ -178,17 +229,19 @@ def tool_open_folder(params):
         subprocess.Popen(f'explorer "{name}"')
         return f"Opened folder: {name}"
 
-    # Search in all common locations recursively
-    search_roots = [
-        os.path.expanduser('~\\Desktop'),
-        os.path.expanduser('~\\Documents'),
-        os.path.expanduser('~\\Downloads'),
-        os.path.expanduser('~'),
-        'C:\\Users\\Nitin',
-    ]
+    # Ranked fuzzy match against the folder index
+    if FOLDER_INDEX.ready:
+        started = time.time()
+        found   = FOLDER_INDEX.best(name)
+        print(f"[TOOL] Folder lookup '{name}' → {found} ({(time.time() - started) * 1000:.1f} ms)")
+        if found:
+            subprocess.Popen(f'explorer "{found}"')
+            return f"Found and opened folder: {found}"
+        return _explorer_search(name)
 
+    # Index still building — walk the common locations like before
     found = None
-    for root in search_roots:
+    for root in FOLDER_SEARCH_ROOTS:
         if not os.path.exists(root):
             continue
         try:
@@ -208,7 +261,10 @@ def tool_open_folder(params):
         subprocess.Popen(f'explorer "{found}"')
         return f"Found and opened folder: {found}"
 
-    # Last resort: open Explorer with Windows search
+    return _explorer_search(name)
+
+def _explorer_search(name):
+    """Last resort: open Explorer with Windows search."""
     subprocess.Popen(
         f'explorer "search-ms:displayname=Search Results&query={name}"',
         shell=True
@@ -218,17 +274,37 @@ def tool_open_folder(params):
 # ════════════════════════════════════════════
 # 5. CLOSE APP
 # ════════════════════════════════════════════
+# Process names that differ from what APP_MAP launches (UWP apps, launchers)
+PROCESS_ALIASES = {
+    'calculator':   ['calculatorapp', 'calculator', 'calc'],
+    'terminal':     ['windowsterminal', 'cmd', 'powershell'],
+    'task manager': ['taskmgr'],
+    'paint':        ['mspaint', 'paintstudio.view'],
+    'notepad':      ['notepad'],
+}
+
+def app_process_names(target):
+    """Executable names to look for when closing `target`."""
+    names = list(PROCESS_ALIASES.get(target, []))
+    if target in APP_MAP:
+        names.append(exe_name(APP_MAP[target]))
+    return names or [target]
+
+PROCESSES = ProcessIndex()
+PROCESSES.start()
+
 def tool_close_app(params):
-    target = params.get('target', '').lower()
-    killed = []
-    for proc in psutil.process_iter(['name']):
-        if target in proc.info['name'].lower():
-            try:
-                proc.kill()
-                killed.append(proc.info['name'])
-            except:
-                pass
-    return f"Closed: {', '.join(set(killed))}." if killed else f"No process found for '{target}'."
+    target = params.get('target', '').lower().strip()
+    if not target:
+        return "Which app should I close?"
+    procs = PROCESSES.find(app_process_names(target))
+    if not procs:
+        return f"No process found for '{target}'."
+    names = sorted({PROCESSES.names.get(p.pid, target) for p in procs})
+    closed, survivors = PROCESSES.kill_trees(procs, timeout=3)
+    if survivors:
+        return f"Closed {closed} process(es) for {target}, but {len(survivors)} would not exit."
+    return f"Closed: {', '.join(names)}."
 
 # ════════════════════════════════════════════
 # 6. READ FILE — searches everywhere
@@ -478,29 +554,39 @@ def tool_volume(params):
 # ════════════════════════════════════════════
 # 16. SYSTEM INFO
 # ════════════════════════════════════════════
+# Sampled in the background so answers never wait on cpu_percent(interval=1)
+METRICS = MetricsSampler(interval=float(os.getenv("METRICS_INTERVAL", "2")))
+METRICS.start()
+
+def _trend(now, avg_peak, unit="%"):
+    if not avg_peak:
+        return f"{now}{unit}"
+    avg, peak = avg_peak
+    return f"{now}{unit} (last minute avg {avg}{unit}, peak {peak}{unit})"
+
 def tool_system_info(params):
     query = params.get('query','all').lower()
     try:
         info = {}
+        now  = METRICS.latest()
+        last = METRICS.window(60)
         if query in ('all','cpu'):
-            info['CPU Usage'] = f"{psutil.cpu_percent(interval=1)}%"
-            info['CPU Cores'] = psutil.cpu_count()
+            info['CPU Usage'] = _trend(now['cpu'], last.get('cpu'))
+            info['CPU Cores'] = METRICS.static.get('cpu_cores')
         if query in ('all','memory','ram'):
-            mem = psutil.virtual_memory()
-            info['RAM Total']     = f"{mem.total//(1024**3)} GB"
-            info['RAM Used']      = f"{mem.used//(1024**3)} GB"
-            info['RAM Available'] = f"{mem.available//(1024**3)} GB"
-            info['RAM %']         = f"{mem.percent}%"
-        if query in ('all','disk'):
-            disk = psutil.disk_usage('C:\\')
-            info['Disk Total'] = f"{disk.total//(1024**3)} GB"
-            info['Disk Free']  = f"{disk.free//(1024**3)} GB"
+            info['RAM Total']     = f"{METRICS.static.get('ram_total_gb')} GB"
+            info['RAM Used']      = f"{int(now['ram_used_gb'])} GB"
+            info['RAM Available'] = f"{int(now['ram_available_gb'])} GB"
+            info['RAM %']         = _trend(now['ram_percent'], last.get('ram_percent'))
+        if query in ('all','disk') and now['disk_free_gb'] is not None:
+            info['Disk Total'] = f"{METRICS.static.get('disk_total_gb')} GB"
+            info['Disk Free']  = f"{int(now['disk_free_gb'])} GB"
         if query in ('all','system','os'):
             info['OS']       = platform.system()+' '+platform.release()
             info['Hostname'] = platform.node()
         if query in ('all','battery'):
-            b = psutil.sensors_battery()
-            if b: info['Battery'] = f"{b.percent}% {'(charging)' if b.power_plugged else ''}"
+            if now['battery'] is not None:
+                info['Battery'] = f"{now['battery']}% {'(charging)' if now['plugged'] else ''}"
         return "\n".join(f"{k}: {v}" for k,v in info.items()) or "No info."
     except Exception as e:
         return f"System info failed: {e}"
@@ -566,16 +652,108 @@ TOOLS = {
     'desktop_icons': tool_desktop_icons,
 }
 
-@app.route('/execute', methods=['POST'])
-def execute():
-    data   = request.get_json()
-    tool   = data.get('tool', 'general')
-    params = data.get('params', {})
+@app.route('/index_status', methods=['GET'])
+def index_status():
+    return jsonify(FILE_INDEX.status())
+
+@app.route('/index_lookup', methods=['GET'])
+def index_lookup():
+    name = request.args.get('name', '')
+    mode = request.args.get('mode', 'exact')
+    if not name:
+        return jsonify({"error": "No name provided"}), 400
+    lookups = {
+        'exact':   FILE_INDEX.exact,
+        'nocase':  FILE_INDEX.lookup,
+        'prefix':  FILE_INDEX.prefix,
+        'pattern': FILE_INDEX.pattern,
+    }
+    fn = lookups.get(mode)
+    if not fn:
+        return jsonify({"error": f"Unknown mode: {mode}"}), 400
+    started = time.time()
+    results = fn(name)
+    return jsonify({"results": results, "ms": round((time.time() - started) * 1000, 2)})
+
+# Seconds a caller waits for each tool before giving up on it
+TOOL_DEADLINES = {
+    'web_search':  10,
+    'find_file':   20,
+    'delete_file': 20,
+    'read_file':   20,
+    'open_folder': 20,
+    'system_info': 5,
+    'get_time':    2,
+    'general':     2,
+    'read_screen': 25,
+    'click_icon':  25,
+}
+# Tools that drive the mouse, keyboard or window focus run one at a time
+SERIAL_TOOLS = {'mouse', 'keyboard', 'window', 'click_icon'}
+
+EXECUTOR = ToolExecutor(
+    workers=int(os.getenv("TOOL_WORKERS", "8")),
+    serial=SERIAL_TOOLS,
+    deadlines=TOOL_DEADLINES,
+    default_deadline=float(os.getenv("TOOL_DEADLINE", "15")),
+)
+
+def call_tool(tool, params):
+    """Runs a tool through the executor; raises ToolTimeout past its deadline."""
     print(f"[TOOL] Running: {tool} with {params}")
-    fn     = TOOLS.get(tool, tool_general)
-    result = fn(params)
+    result = EXECUTOR.run(tool, TOOLS.get(tool, tool_general), params)
     print(f"[TOOL] Result: {str(result)[:120]}")
-    return jsonify({"result": result})
+    return result
+
+def run_tool(tool, params):
+    try:
+        return call_tool(tool, params)
+    except ToolTimeout as e:
+        print(f"[TOOL] {e}")
+        return str(e)
+
+def handle_plan(data):
+    """Several tool calls in one request; independent steps run in parallel."""
+    try:
+        steps = tool_plan.normalize(data.get('steps'))
+    except tool_plan.PlanError as e:
+        return {"result": f"I couldn't follow that plan: {e}", "error": str(e)}
+    started = time.time()
+    reports = tool_plan.run(steps, call_tool, tool_plan.POOL)
+    wall    = (time.time() - started) * 1000
+    print(f"[TOOL] Plan of {len(steps)} steps in {wall:.0f}ms "
+          f"(sequential would be ~{sum(r['ms'] for r in reports):.0f}ms)")
+    return {"result": tool_plan.merge(reports), "steps": reports, "ms": round(wall, 1)}
+
+def handle_execute(data):
+    if data.get('steps'):
+        return handle_plan(data)
+    return {"result": run_tool(data.get('tool', 'general'), data.get('params', {}))}
+
+def handle_tool_stats(data):
+    return {**EXECUTOR.stats(), "search": SEARCH.stats(), "processes": PROCESSES.stats()}
+
+# Used by the gateway when all services run in one process
+HANDLERS = {
+    '/execute':    handle_execute,
+    '/tool_stats': handle_tool_stats,
+}
+
+@app.route('/execute', methods=['POST'])
+def execute():
+    return jsonify(handle_execute(request.get_json()))
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    seconds = request.args.get('seconds', type=float)
+    fields  = request.args.get('fields')
+    if fields:
+        return jsonify(METRICS.series(seconds, fields.split(',')))
+    return jsonify(METRICS.series(seconds))
+
+@app.route('/tool_stats', methods=['GET'])
+def tool_stats():
+    return jsonify(handle_tool_stats({}))
 
 if __name__ == '__main__':
     app.run(port=5003, debug=False)
@@ -8,18 +8,26 @@ app = Flask(__name__)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 AUDIO_PATH = os.path.join(BASE_DIR, "response.mp3")
 
-@app.route('/speak', methods=['POST'])
-def speak():
-    data = request.get_json()
+def handle_speak(data):
     text = data.get('text', 'No response.')
     try:
         tts = gTTS(text=text, lang='en')
         tts.save(AUDIO_PATH)
         print(f"[TTS] Saved audio to {AUDIO_PATH}")
-        return jsonify({"status": "ok", "message": "Audio ready."})
+        return {"status": "ok", "message": "Audio ready."}
     except Exception as e:
         print(f"[TTS ERROR] {e}")
-        return jsonify({"error": str(e)}), 500
+        return {"error": str(e)}
+
+# Used by the gateway when all services run in one process
+HANDLERS = {
+    '/speak': handle_speak,
+}
+
+@app.route('/speak', methods=['POST'])
+def speak():
+    result = handle_speak(request.get_json())
+    return jsonify(result), 500 if "error" in result else 200
 
 @app.route('/audio', methods=['GET'])
 def get_audio():
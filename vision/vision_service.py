@@ -2,15 +2,18 @@
 # Gives AURA eyes — it can SEE your screen and click on things
 
 from flask import Flask, request, jsonify
-from groq import Groq
 from PIL import ImageGrab, Image
 import pyautogui
-import base64, io, os, json, time
+import base64, io, os, sys, json, time
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "llm"))
+from llm_provider import get_provider
+
 load_dotenv()
 app = Flask(__name__)
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+LLM = get_provider()
+VISION_MODEL = os.getenv("LLM_VISION_MODEL", "meta-llama/llama-4-scout-17b-16e-instruct")
 
 SCREENSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "screen.png")
 
@@ -28,12 +31,12 @@ def take_screenshot(region=None):
         print(f"[VISION] Screenshot failed: {e}")
         return None
 
-# ── Ask Groq Vision what's on screen ────────────────────────
+# ── Ask the vision model what's on screen ───────────────────
 def ask_vision(b64_image, question):
-    """Send screenshot to Groq vision model and ask a question."""
+    """Send screenshot to the vision model and ask a question."""
     try:
-        response = client.chat.completions.create(
-            model="meta-llama/llama-4-scout-17b-16e-instruct",  # Groq vision model
+        answer = LLM.complete(
+            model=VISION_MODEL,
             messages=[
                 {
                     "role": "user",
@@ -53,7 +56,7 @@ def ask_vision(b64_image, question):
             ],
             max_tokens=1000,
         )
-        return response.choices[0].message.content.strip()
+        return answer.strip()
     except Exception as e:
         print(f"[VISION ERROR] {e}")
         return None
@@ -83,38 +86,38 @@ Return ONLY the JSON. Nothing else."""
 # ROUTES
 # ════════════════════════════════════════════════════════════
 
+# Handlers take the request JSON and return a dict; a screenshot failure
+# carries an "error" key so the HTTP routes can answer with a 500.
+SCREENSHOT_FAILED = {"result": "Could not take screenshot.", "error": "screenshot failed"}
+
 # 1. READ SCREEN — tell AURA what's on screen
-@app.route('/read_screen', methods=['POST'])
-def read_screen():
+def handle_read_screen(data):
     """Take screenshot and describe what's visible."""
-    data     = request.get_json() or {}
     question = data.get('question', 'What applications, icons, and folders do you see on the desktop? List everything visible.')
     print(f"[VISION] Reading screen...")
     b64 = take_screenshot()
     if not b64:
-        return jsonify({"result": "Could not take screenshot."}), 500
+        return SCREENSHOT_FAILED
     answer = ask_vision(b64, question)
     print(f"[VISION] Screen says: {str(answer)[:150]}")
-    return jsonify({"result": answer or "Could not read screen."})
+    return {"result": answer or "Could not read screen."}
 
 # 2. CLICK ICON — find and click something by name
-@app.route('/click_icon', methods=['POST'])
-def click_icon():
+def handle_click_icon(data):
     """Find an icon/app/folder by name and click it."""
-    data   = request.get_json() or {}
     target = data.get('target', '')
     action = data.get('action', 'double_click')  # single_click or double_click
 
     print(f"[VISION] Looking for '{target}' on screen...")
     b64  = take_screenshot()
     if not b64:
-        return jsonify({"result": "Could not take screenshot."}), 500
+        return SCREENSHOT_FAILED
 
     loc = find_icon_location(b64, target)
     print(f"[VISION] Found: {loc}")
 
     if not loc.get('found'):
-        return jsonify({"result": f"I couldn't find '{target}' on your screen. {loc.get('description','')}"})
+        return {"result": f"I couldn't find '{target}' on your screen. {loc.get('description','')}"}
 
     x, y = int(loc['x']), int(loc['y'])
 
@@ -130,33 +133,29 @@ def click_icon():
     else:
         pyautogui.click(x, y)
 
-    return jsonify({"result": f"Found '{target}' and clicked it. {loc.get('description', '')}"})
+    return {"result": f"Found '{target}' and clicked it. {loc.get('description', '')}"}
 
 # 3. DESCRIBE SCREEN — what is AURA currently looking at
-@app.route('/describe', methods=['POST'])
-def describe():
+def handle_describe(data):
     """Full description of current screen state."""
     b64 = take_screenshot()
     if not b64:
-        return jsonify({"result": "Could not take screenshot."}), 500
+        return SCREENSHOT_FAILED
     answer = ask_vision(b64, "Describe exactly what is on this screen in detail. List all visible icons, windows, folders, text, and taskbar items.")
-    return jsonify({"result": answer or "Could not describe screen."})
+    return {"result": answer or "Could not describe screen."}
 
 # 4. FIND TEXT ON SCREEN
-@app.route('/find_text', methods=['POST'])
-def find_text():
+def handle_find_text(data):
     """Find specific text visible on screen."""
-    data = request.get_json() or {}
     text = data.get('text', '')
     b64  = take_screenshot()
     if not b64:
-        return jsonify({"result": "Could not take screenshot."}), 500
+        return SCREENSHOT_FAILED
     answer = ask_vision(b64, f"Is the text '{text}' visible anywhere on this screen? If yes, describe where it is and return its approximate x,y coordinates as JSON. If no, say not found.")
-    return jsonify({"result": answer or "Could not search screen."})
+    return {"result": answer or "Could not search screen."}
 
 # 5. GET DESKTOP ICONS — list all icons on desktop
-@app.route('/desktop_icons', methods=['GET'])
-def desktop_icons():
+def handle_desktop_icons(data):
     """List all icons visible on desktop + from filesystem."""
     # Method 1: Read from filesystem (reliable)
     desktop_path = os.path.join(os.path.expanduser('~'), 'Desktop')
@@ -172,11 +171,44 @@ def desktop_icons():
     b64    = take_screenshot()
     visual = ask_vision(b64, "List ALL icons you can see on the desktop. Include their approximate positions (left/center/right, top/middle/bottom of screen).") if b64 else "Screenshot failed."
 
-    return jsonify({
+    return {
         "filesystem": fs_result,
         "visual":     visual or "Could not scan visually.",
         "result":     fs_result  # used by gateway
-    })
+    }
+
+# Used by the gateway when all services run in one process
+HANDLERS = {
+    '/read_screen':   handle_read_screen,
+    '/click_icon':    handle_click_icon,
+    '/describe':      handle_describe,
+    '/find_text':     handle_find_text,
+    '/desktop_icons': handle_desktop_icons,
+}
+
+def _respond(path):
+    result = HANDLERS[path](request.get_json(silent=True) or {})
+    return jsonify(result), 500 if "error" in result else 200
+
+@app.route('/read_screen', methods=['POST'])
+def read_screen():
+    return _respond('/read_screen')
+
+@app.route('/click_icon', methods=['POST'])
+def click_icon():
+    return _respond('/click_icon')
+
+@app.route('/describe', methods=['POST'])
+def describe():
+    return _respond('/describe')
+
+@app.route('/find_text', methods=['POST'])
+def find_text():
+    return _respond('/find_text')
+
+@app.route('/desktop_icons', methods=['GET'])
+def desktop_icons():
+    return _respond('/desktop_icons')
 
 if __name__ == '__main__':
     print("[VISION] Screen vision service running on port 5005...")